@@ -0,0 +1,107 @@
+import threading
+import pygame
+
+# Sound effects used by the game
+SOUND_FILES = {
+    "chomp": 'assets/sounds/chomp.wav',
+    "death": 'assets/sounds/death.wav',
+    "eat_ghost": 'assets/sounds/eat_ghost.wav',
+    "power_pellet": 'assets/sounds/power_pellet.wav',
+}
+
+# Images decoded ahead of time so the game objects can pick them up
+IMAGE_FILES = [
+    'assets/images/logo.png',
+    'assets/images/wall.png',
+    'assets/images/pacman_right.png',
+    'assets/images/pacman_left.png',
+    'assets/images/pacman_up.png',
+    'assets/images/pacman_down.png',
+    'assets/images/ghost.png',
+    'assets/images/frightened_ghost.png',
+]
+
+# Decoded images keyed by path (None means the file could not be loaded)
+_images = {}
+_images_lock = threading.Lock()
+_active_loader = None
+
+def load_image(path):
+    """Get a decoded image, loading it on first use.
+
+    Raises pygame.error if the file is missing, or if a background loader is
+    still decoding images, so callers can fall back to plain shapes.
+    """
+    with _images_lock:
+        if path in _images:
+            image = _images[path]
+            if image is None:
+                raise pygame.error(f"Could not load {path}")
+            return image
+
+    if _active_loader is not None and not _active_loader.images_ready.is_set():
+        raise pygame.error(f"{path} is still loading")
+
+    return _decode_image(path)
+
+def _decode_image(path):
+    """Decode an image from disk and remember the result"""
+    try:
+        image = pygame.image.load(path)
+    except Exception:
+        image = None
+
+    with _images_lock:
+        _images[path] = image
+
+    if image is None:
+        raise pygame.error(f"Could not load {path}")
+    return image
+
+class AssetLoader:
+    def __init__(self):
+        """Set up a loader that initializes audio and decodes assets off the main thread"""
+        self.sounds = {}
+        self.has_sounds = False
+        self.images_ready = threading.Event()
+        self.sounds_ready = threading.Event()
+        self.thread = None
+
+    def start(self):
+        """Start loading in the background"""
+        global _active_loader
+        _active_loader = self
+        self.thread = threading.Thread(target=self._run, name="asset-loader", daemon=True)
+        self.thread.start()
+
+    def wait(self, timeout=None):
+        """Block until everything has been loaded (or failed to load)"""
+        return self.sounds_ready.wait(timeout)
+
+    def _run(self):
+        """Decode images, then bring up the mixer and load sounds"""
+        # Images first, they are needed as soon as a game starts
+        for path in IMAGE_FILES:
+            try:
+                _decode_image(path)
+            except pygame.error:
+                pass
+        self.images_ready.set()
+
+        # Mixer init can take a while on some audio devices
+        try:
+            pygame.mixer.init()
+            sounds = {}
+            for name, path in SOUND_FILES.items():
+                sounds[name] = pygame.mixer.Sound(path)
+            self.sounds = sounds
+            self.has_sounds = True
+        except Exception:
+            self.has_sounds = False
+        self.sounds_ready.set()
+
+    def get_sound(self, name):
+        """Get a loaded sound, or None if sounds are not (yet) available"""
+        if not self.has_sounds:
+            return None
+        return self.sounds.get(name)
@@ -0,0 +1,219 @@
+import heapq
+import time
+
+# Grid moves for each direction
+DIRECTIONS = {
+    "UP": (0, -1),
+    "DOWN": (0, 1),
+    "LEFT": (-1, 0),
+    "RIGHT": (1, 0),
+}
+
+OPPOSITE = {"UP": "DOWN", "DOWN": "UP", "LEFT": "RIGHT", "RIGHT": "LEFT"}
+
+# Frames needed for Pac-Man to cross one cell (2 px/frame; ghost speed depends on the level)
+PACMAN_FRAMES_PER_CELL = 15
+
+# Search costs
+DEATH_COST = 1000  # Cell a ghost can reach before (or right after) Pac-Man
+NEAR_GHOST_COST = 20  # Extra cost for cells close to a ghost
+SAFETY_MARGIN = 30  # Frames of slack when comparing arrival times
+GHOST_SEARCH_DEPTH = 12  # How far ahead ghost reach is computed (in cells)
+FALLBACK_RESERVE = 0.25  # Share of the budget kept back for the heuristic fallback
+
+def at_cell_center(pacman, game_map):
+    """Whether Pac-Man is on a cell center, where an agent may turn him
+
+    Only ever turn at cell centers; if stopped short of one, he is sent
+    back to it.
+    """
+    cell_size = game_map.cell_size
+    half = cell_size // 2
+    if pacman.x % cell_size == half and pacman.y % cell_size == half:
+        return True
+    if not pacman.can_move(pacman.direction, game_map):
+        pacman.change_direction(OPPOSITE[pacman.direction])
+    return False
+
+class Autopilot:
+    def __init__(self, budget_ms=1.0):
+        """Plan Pac-Man's moves over the map grid within a per-tick time budget"""
+        self.budget = budget_ms / 1000.0
+        self.plans = 0
+        self.fallbacks = 0
+        self.overruns = 0  # Plans that took longer than the budget
+        self.total_time = 0.0
+        self.max_time = 0.0
+
+    def update(self, game):
+        """Pick a direction for Pac-Man (call once per tick before Game moves him)"""
+        pacman = game.pacman
+        if not at_cell_center(pacman, game.map):
+            return
+
+        # Stop searching early enough that the fallback still fits in the budget
+        start = time.perf_counter()
+        deadline = start + self.budget * (1 - FALLBACK_RESERVE)
+        direction = self.plan(game, deadline)
+        if direction is None:
+            self.fallbacks += 1
+            direction = self.heuristic(game)
+
+        if direction is not None and direction != pacman.direction:
+            pacman.change_direction(direction)
+
+        elapsed = time.perf_counter() - start
+        self.plans += 1
+        self.total_time += elapsed
+        self.max_time = max(self.max_time, elapsed)
+        if elapsed > self.budget:
+            self.overruns += 1
+
+    def cell_of(self, game_map, x, y):
+        """Grid cell of a pixel position"""
+        return int(x // game_map.cell_size), int(y // game_map.cell_size)
+
+    def neighbors(self, game_map, cell):
+        """Open neighboring cells with the direction leading to them"""
+        x, y = cell
+        for direction in game_map.compiled.exits.get(cell, ()):
+            dx, dy = DIRECTIONS[direction]
+            yield direction, (x + dx, y + dy)
+
+    def ghost_reach(self, game, deadline):
+        """Frames until the nearest dangerous ghost could reach each nearby cell
+
+        Returns None if the deadline passes.
+        """
+        game_map = game.map
+        reach = {}
+        for ghost in game.ghosts:
+            if ghost.frightened:
+                continue
+            frames_per_cell = game_map.cell_size / ghost.speed
+            start = self.cell_of(game_map, ghost.x, ghost.y)
+
+            # Use the map's precomputed distances when it has them
+            if game_map.distances is not None and start in game_map.distances:
+                for cell, depth in game_map.distances[start].items():
+                    if depth <= GHOST_SEARCH_DEPTH:
+                        frames = depth * frames_per_cell
+                        if frames < reach.get(cell, float('inf')):
+                            reach[cell] = frames
+                    if time.perf_counter() > deadline:
+                        return None
+                continue
+
+            frontier = [start]
+            seen = {start}
+            depth = 0
+            while frontier and depth <= GHOST_SEARCH_DEPTH:
+                frames = depth * frames_per_cell
+                next_frontier = []
+                for cell in frontier:
+                    if frames < reach.get(cell, float('inf')):
+                        reach[cell] = frames
+                    for _, neighbor in self.neighbors(game_map, cell):
+                        if neighbor not in seen:
+                            seen.add(neighbor)
+                            next_frontier.append(neighbor)
+                frontier = next_frontier
+                depth += 1
+                if time.perf_counter() > deadline:
+                    return None
+        return reach
+
+    def plan(self, game, deadline):
+        """Uniform-cost search to the cheapest pellet or catchable ghost
+
+        Cells a ghost can reach first are heavily penalized. If every target
+        is behind such a cell, head the way that stays safe the longest
+        instead. Returns the first direction of the chosen path, or None if
+        there is nothing to do or the deadline passed.
+        """
+        game_map = game.map
+        layout = game_map.layout
+        reach = self.ghost_reach(game, deadline)
+        if reach is None:
+            return None
+
+        # Frightened ghosts worth chasing, by cell
+        prey = {}
+        if game.power_mode:
+            for ghost in game.ghosts:
+                if ghost.frightened:
+                    prey[self.cell_of(game_map, ghost.x, ghost.y)] = ghost
+
+        start = self.cell_of(game_map, game.pacman.x, game.pacman.y)
+        queue = [(0, 0, 0, start, None)]
+        best = {start: 0}
+        order = 0
+        safe_depth = {}  # Deepest cell reachable without passing a ghost, per first direction
+
+        while queue:
+            cost, steps, _, cell, first = heapq.heappop(queue)
+            if cost > best.get(cell, float('inf')):
+                continue
+
+            if first is not None:
+                x, y = cell
+                is_target = layout[y][x] in (2, 3) or (
+                    cell in prey and game.power_timer > steps * PACMAN_FRAMES_PER_CELL + SAFETY_MARGIN
+                )
+                if is_target:
+                    if cost < DEATH_COST:
+                        return first
+                    return self.escape_direction(safe_depth, first)
+                if cost < DEATH_COST and steps > safe_depth.get(first, 0):
+                    safe_depth[first] = steps
+
+            if time.perf_counter() > deadline:
+                return None
+
+            arrival = (steps + 1) * PACMAN_FRAMES_PER_CELL
+            for direction, neighbor in self.neighbors(game_map, cell):
+                step_cost = 1
+                ghost_frames = reach.get(neighbor)
+                if ghost_frames is not None:
+                    if ghost_frames <= arrival + SAFETY_MARGIN:
+                        step_cost += DEATH_COST
+                    else:
+                        step_cost += NEAR_GHOST_COST * SAFETY_MARGIN // (ghost_frames - arrival)
+                new_cost = cost + step_cost
+                if new_cost < best.get(neighbor, float('inf')):
+                    best[neighbor] = new_cost
+                    order += 1
+                    heapq.heappush(queue, (new_cost, steps + 1, order, neighbor, first or direction))
+
+        return self.escape_direction(safe_depth, None)
+
+    def escape_direction(self, safe_depth, default):
+        """Direction that stays clear of ghosts the longest"""
+        if not safe_depth:
+            return default
+        return max(safe_depth, key=safe_depth.get)
+
+    def heuristic(self, game):
+        """Cheap fallback: step to the neighbor farthest from ghosts, preferring pellets"""
+        game_map = game.map
+        layout = game_map.layout
+        start = self.cell_of(game_map, game.pacman.x, game.pacman.y)
+        ghost_cells = [self.cell_of(game_map, ghost.x, ghost.y) for ghost in game.ghosts if not ghost.frightened]
+
+        best_direction = None
+        best_score = float('-inf')
+        for direction, (x, y) in self.neighbors(game_map, start):
+            nearest = min((abs(x - gx) + abs(y - gy) for gx, gy in ghost_cells), default=99)
+            score = min(nearest, 5) * 10 + (5 if layout[y][x] in (2, 3) else 0)
+            if direction == game.pacman.direction:
+                score += 1  # Avoid dithering between equal choices
+            if score > best_score:
+                best_score = score
+                best_direction = direction
+        return best_direction
+
+    def report(self):
+        """Planning time statistics as a short text summary"""
+        mean = self.total_time / self.plans * 1000 if self.plans else 0.0
+        return (f"autopilot: {self.plans} plans, mean {mean:.3f} ms, max {self.max_time * 1000:.3f} ms, "
+                f"budget {self.budget * 1000:.3f} ms, {self.overruns} over budget, {self.fallbacks} heuristic fallbacks")
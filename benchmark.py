@@ -0,0 +1,679 @@
+"""Performance benchmarks for the Pac-Man clone.
+
+Run one with `python benchmark.py <name>` (see --help for the list).
+Set SDL_VIDEODRIVER=dummy and SDL_AUDIODRIVER=dummy to run them on a
+machine without a display or sound card.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+# Measured in a fresh interpreter so imports are really cold
+STARTUP_PROBE = """
+import time
+t0 = time.perf_counter()
+import pygame
+import main
+t_import = time.perf_counter() - t0
+screen = main.init_display()
+assets = main.AssetLoader()
+assets.start()
+game = main.Game(screen, assets)
+game.draw()
+pygame.display.flip()
+t_frame = time.perf_counter() - t0
+assets.wait()
+t_sounds = time.perf_counter() - t0
+print(t_import, t_frame, t_sounds, assets.has_sounds)
+"""
+
+def bench_startup(args):
+    """Time import, first menu frame and sound availability on a cold start"""
+    here = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT="1")
+    imports, frames, sounds = [], [], []
+    has_sounds = False
+
+    for _ in range(args.runs):
+        out = subprocess.run(
+            [sys.executable, "-c", STARTUP_PROBE],
+            cwd=here, env=env, capture_output=True, text=True, check=True
+        ).stdout.split()
+        imports.append(float(out[0]))
+        frames.append(float(out[1]))
+        sounds.append(float(out[2]))
+        has_sounds = out[3] == "True"
+
+    print(f"startup over {args.runs} runs (median)")
+    print(f"  import:          {statistics.median(imports) * 1000:7.1f} ms")
+    print(f"  first frame:     {statistics.median(frames) * 1000:7.1f} ms")
+    print(f"  sounds ready:    {statistics.median(sounds) * 1000:7.1f} ms"
+          f"{'' if has_sounds else '  (no sounds found, silent fallback)'}")
+
+def bench_env(args):
+    """Measure headless environment steps per second with random actions"""
+    import random
+    import time
+    from env import PacManEnv
+
+    env = PacManEnv()
+    rng = random.Random(0)
+    rates = []
+
+    for run in range(args.runs):
+        env.reset(seed=run)
+        steps = 0
+        start = time.perf_counter()
+        while steps < args.steps:
+            _, _, terminated, truncated, _ = env.step(rng.randrange(env.num_actions))
+            steps += 1
+            if terminated or truncated:
+                env.reset()
+        rates.append(steps / (time.perf_counter() - start))
+
+    print(f"env over {args.runs} runs of {args.steps} steps (median)")
+    print(f"  throughput:      {statistics.median(rates):9.0f} steps/s")
+
+def bench_pixels(args):
+    """Compare small off-screen pixel observations against the full 800x600 frame"""
+    import time
+    import pygame
+    import main
+    from env import PacManEnv
+    from pixel_obs import PixelRenderer
+
+    pygame.font.init()
+    env = PacManEnv()
+    env.reset(seed=0)
+    frames = args.steps // 10
+
+    def rate(render):
+        start = time.perf_counter()
+        for i in range(frames):
+            if i % 4 == 0:
+                env.step(4)
+            render()
+        return frames / (time.perf_counter() - start)
+
+    # Full resolution: draw the real frame, copy it out and shrink it
+    screen = pygame.Surface((main.SCREEN_WIDTH, main.SCREEN_HEIGHT))
+    game = env.game
+    game.screen = screen
+    game.ui = main.UI(screen)
+    def full_frame():
+        game.draw()
+        pygame.surfarray.array3d(pygame.transform.smoothscale(screen, (84, 84)))
+
+    results = [("full 800x600 + copy", full_frame)]
+    for size, stack in ((None, 1), ((84, 84), 1), ((84, 84), 4)):
+        renderer = PixelRenderer(game, size, stack)
+        label = f"{renderer.size[0]}x{renderer.size[1]}" + (f" stack={stack}" if stack > 1 else "")
+        results.append((label, renderer.render))
+
+    print(f"pixels over {frames} frames (median of {args.runs} runs)")
+    for label, render in results:
+        print(f"  {label:22s} {statistics.median(rate(render) for _ in range(args.runs)):9.0f} frames/s")
+
+def bench_autopilot(args):
+    """Play headless games with the autopilot and report results and planning cost"""
+    from env import PacManEnv
+    from autopilot import Autopilot
+
+    env = PacManEnv()
+    autopilot = Autopilot(args.budget)
+    env.game.autopilot = autopilot
+    cleared = []
+
+    for run in range(args.runs):
+        env.reset(seed=run)
+        for _ in range(args.steps):
+            _, _, terminated, _, info = env.step(0)
+            if terminated:
+                break
+        game = env.game
+        cleared.append(game.collected_pellets / game.total_pellets)
+        print(f"  game {run}: {info['state']:9s} score {info['score']:6d}, level {info['level']}, "
+              f"{game.collected_pellets}/{game.total_pellets} pellets")
+
+    print(f"autopilot over {args.runs} games: {statistics.mean(cleared) * 100:.0f}% of the last level's pellets cleared on average")
+    print(f"  {autopilot.report()}")
+
+def bench_snapshot(args):
+    """Time snapshot/restore of a game in progress and size the rewind buffer"""
+    import time
+    from env import PacManEnv
+    from autopilot import Autopilot
+    from snapshot import StateCodec, RewindBuffer
+
+    env = PacManEnv()
+    env.reset(seed=0)
+    game = env.game
+    game.autopilot = Autopilot()
+    codec = StateCodec.for_game(game)
+
+    # Two nearby states a few pellets apart, like consecutive search nodes
+    for _ in range(300):
+        env.step(0)
+    before = codec.pack(game)
+    for _ in range(60):
+        env.step(0)
+    after = codec.pack(game)
+
+    def per_call(func):
+        start = time.perf_counter()
+        for _ in range(args.steps):
+            func()
+        return (time.perf_counter() - start) / args.steps * 1e6
+
+    pack = statistics.median(per_call(lambda: codec.pack(game)) for _ in range(args.runs))
+    restore = statistics.median(
+        per_call(lambda: (codec.restore(game, before), codec.restore(game, after))) / 2 for _ in range(args.runs)
+    )
+    rewind = RewindBuffer(game, 60, 60)
+
+    print(f"snapshot ({codec.size} bytes per state, median of {args.runs} runs)")
+    print(f"  pack:            {pack:7.2f} us")
+    print(f"  restore:         {restore:7.2f} us")
+    print(f"  60 s rewind:     {rewind.nbytes / 1024:7.0f} KiB")
+
+def bench_rollout(args):
+    """Measure Monte Carlo rollouts per second on thread and process pools"""
+    from env import PacManEnv
+    from rollout import RolloutPlanner
+
+    steps = min(args.steps, 2000)
+    print(f"rollout planner over {steps} game ticks per pool")
+    for use_processes in (False, True):
+        env = PacManEnv()
+        env.reset(seed=0)
+        planner = RolloutPlanner(use_processes=use_processes)
+        env.game.autopilot = planner
+        for _ in range(steps):
+            _, _, terminated, _, _ = env.step(0)
+            if terminated:
+                env.reset()
+        planner.close()
+        print(f"  {'processes' if use_processes else 'threads':9s}  {planner.report()}")
+
+def bench_netplay(args):
+    """Measure server tick rate and per-tick bandwidth with many loopback spectators"""
+    import asyncio
+    import time
+    from netplay import GameServer, SpectatorClient
+
+    ticks = min(args.steps, 2000)
+
+    async def run(num_games, num_clients):
+        server = GameServer(num_games, fps=None, autopilot=True)
+        port = await server.start(port=0)
+        clients = [SpectatorClient() for _ in range(num_clients)]
+        for i, client in enumerate(clients):
+            await client.connect(port=port, game_id=i % num_games)
+
+        async def pump(client):
+            while await client.receive():
+                pass
+
+        pumps = [asyncio.create_task(pump(client)) for client in clients]
+        await asyncio.sleep(0.1)  # Let everyone receive their full state
+        received = sum(client.bytes_received for client in clients)
+        start = time.perf_counter()
+        await server.run(ticks)
+        elapsed = time.perf_counter() - start
+        await asyncio.sleep(0.1)
+        received = sum(client.bytes_received for client in clients) - received
+
+        await server.close()
+        for task in pumps:
+            task.cancel()
+        for client in clients:
+            await client.close()
+        return server, elapsed, received
+
+    print(f"netplay over {ticks} ticks (server and clients share one process)")
+    for num_games, num_clients in ((1, 1), (4, 16), (8, 64), (16, 256)):
+        server, elapsed, received = asyncio.run(run(num_games, num_clients))
+        per_tick = received / ticks / num_clients
+        print(f"  {num_games:2d} games, {num_clients:3d} clients: {ticks / elapsed:7.0f} server ticks/s "
+              f"({server.tick_time / ticks * 1000:.3f} ms tick+broadcast), "
+              f"{per_tick:5.1f} bytes/tick per client")
+
+def bench_capture(args):
+    """Run a paced 60 FPS loop while capturing and count missed deadlines and drops"""
+    import tempfile
+    import time
+    import pygame
+    import main
+    from capture import FrameRecorder
+    from env import PacManEnv
+
+    pygame.font.init()
+    frames = min(args.steps, 600)
+    budget = 1 / main.FPS
+
+    def loop(capture):
+        env = PacManEnv()
+        env.reset(seed=0)
+        game = env.game
+        game.screen = pygame.Surface((main.SCREEN_WIDTH, main.SCREEN_HEIGHT))
+        game.ui = main.UI(game.screen)
+        missed = 0
+        worst = 0.0
+        for _ in range(frames):
+            start = time.perf_counter()
+            env.step(0)
+            game.draw()
+            capture(game.screen)
+            elapsed = time.perf_counter() - start
+            worst = max(worst, elapsed)
+            if elapsed > budget:
+                missed += 1
+            else:
+                time.sleep(budget - elapsed)
+        return missed, worst
+
+    print(f"capture over {frames} frames at {main.FPS} FPS")
+    with tempfile.TemporaryDirectory() as folder:
+        counter = [0]
+        def save_inline(surface):
+            counter[0] += 1
+            pygame.image.save(surface, os.path.join(folder, f"inline_{counter[0]:06d}.png"))
+        missed, worst = loop(save_inline)
+        print(f"  image.save in loop      {missed:4d} missed deadlines, worst frame {worst * 1000:6.1f} ms")
+
+        for fmt, every in (("png", 1), ("png", 2), ("raw", 1)):
+            target = os.path.join(folder, f"{fmt}{every}" + (".rgb" if fmt == "raw" else ""))
+            recorder = FrameRecorder(target, every, fmt)
+            missed, worst = loop(recorder.capture)
+            recorder.close()
+            print(f"  recorder {fmt} every {every}  {missed:4d} missed deadlines, worst frame {worst * 1000:6.1f} ms, "
+                  f"{recorder.captured} written, {recorder.dropped} dropped")
+
+def bench_levels(args):
+    """Time level transitions with and without background preloading of the next map"""
+    import time
+    import pygame
+    import main
+
+    screen = main.init_display()
+    game = main.Game(screen)
+    game.state = "PLAYING"
+    frames = 30
+
+    def transition(level):
+        start = time.perf_counter()
+        game.start_level(level)
+        elapsed = time.perf_counter() - start
+        # Keep playing while the following level builds in the background
+        worst = 0.0
+        for _ in range(frames):
+            start = time.perf_counter()
+            game.update()
+            game.draw()
+            pygame.display.flip()
+            worst = max(worst, time.perf_counter() - start)
+        game.preloader.wait()
+        return elapsed, worst
+
+    cold, preloaded, worst_frames = [], [], []
+    for run in range(args.runs):
+        level = run % 4 + 2
+        game.preloader.wait()
+        game.preloader.level = None  # Forget the preloaded map
+        cold.append(transition(level)[0])
+        elapsed, worst = transition(level + 1)
+        preloaded.append(elapsed)
+        worst_frames.append(worst)
+
+    print(f"level transitions over {args.runs} runs (median)")
+    print(f"  built on the spot:  {statistics.median(cold) * 1000:6.2f} ms")
+    print(f"  preloaded:          {statistics.median(preloaded) * 1000:6.2f} ms "
+          f"(worst frame while the next level builds {statistics.median(worst_frames) * 1000:.2f} ms)")
+
+def bench_fastforward(args):
+    """Compare update(k) fast-forwarding against k single-tick updates"""
+    import random
+    import time
+    from main import Game
+    from snapshot import snapshot
+
+    def play(skip, batched):
+        game = Game()
+        game.rng.seed(0)
+        game.reset_game()
+        game.state = "PLAYING"
+        rng = random.Random(0)
+        ticks = 0
+        start = time.perf_counter()
+        while ticks < args.steps:
+            if game.state != "PLAYING":
+                game.reset_game()
+                game.state = "PLAYING"
+            # Random input every 16 ticks, like a slow-acting agent
+            if ticks % 16 == 0:
+                game.pacman.change_direction(rng.choice(["UP", "DOWN", "LEFT", "RIGHT"]))
+            if batched:
+                game.update(skip)
+            else:
+                for _ in range(skip):
+                    game.update()
+            ticks += skip
+        return ticks / (time.perf_counter() - start), snapshot(game)
+
+    print(f"fast-forward over {args.runs} runs of {args.steps} ticks (median)")
+    for skip in (4, 16, 64):
+        single, batched, same = [], [], True
+        for _ in range(args.runs):
+            rate, state = play(skip, False)
+            single.append(rate)
+            rate, batched_state = play(skip, True)
+            batched.append(rate)
+            same = same and state == batched_state
+        single_rate = statistics.median(single)
+        batched_rate = statistics.median(batched)
+        print(f"  k={skip:2d}  {single_rate:8.0f} ticks/s one by one, {batched_rate:8.0f} ticks/s update(k) "
+              f"({batched_rate / single_rate:.1f}x, same end state: {'yes' if same else 'NO'})")
+
+def bench_pacing(args):
+    """Play on a simulated slow renderer with and without adaptive frame pacing"""
+    import time
+    import main
+    from pacing import FramePacer
+
+    screen = main.init_display()
+    seconds = 3.0
+
+    def play(paced, slow_ms):
+        game = main.Game(screen)
+        game.state = "PLAYING"
+        if paced:
+            game.pacer = FramePacer(main.FPS)
+        draw = game.draw
+
+        def slow_draw():
+            # Weak hardware: drawing costs slow_ms more, a third of that with effects off
+            effects = game.pacer is None or game.pacer.effects
+            time.sleep(slow_ms / 1000 * (1 if effects else 1 / 3))
+            draw()
+
+        game.draw = slow_draw
+        ticks = 0
+        update = game.update
+
+        def counting_update(steps=1):
+            nonlocal ticks
+            ticks += steps
+            update(steps)
+
+        game.update = counting_update
+        frames = 0
+        start = time.perf_counter()
+        while time.perf_counter() - start < seconds:
+            game.frame()
+            frames += 1
+        elapsed = time.perf_counter() - start
+        return ticks / elapsed, game.pacer
+
+    print(f"pacing over {seconds:.0f} s per run (game speed in ticks/s, {main.FPS} is full speed)")
+    for slow_ms in (0, 12, 30, 60):
+        fixed, _ = play(False, slow_ms)
+        paced, pacer = play(True, slow_ms)
+        drawn = pacer.frames - pacer.skipped
+        print(f"  draw +{slow_ms:2d} ms  clock.tick {fixed:5.1f} ticks/s, paced {paced:5.1f} ticks/s "
+              f"({drawn / seconds:4.1f} frames/s drawn, {pacer.skipped} skipped, "
+              f"effects reduced {pacer.degradations}x)")
+
+def bench_input(args):
+    """Measure input-to-update and input-to-display latency with keys pressed at random times"""
+    import random
+    import threading
+    import time
+    from collections import deque
+    import pygame
+    import main
+    from inputs import InputQueue, percentile
+    from pacing import FramePacer
+
+    screen = main.init_display()
+    seconds = 3.0
+    keys = [pygame.K_UP, pygame.K_DOWN, pygame.K_LEFT, pygame.K_RIGHT]
+
+    def play(paced, slow_ms):
+        game = main.Game(screen)
+        game.inputs = InputQueue()
+        game.turn_buffer = main.TURN_BUFFER
+        game.reset_game()
+        game.state = "PLAYING"
+        if paced:
+            game.pacer = FramePacer(main.FPS)
+        draw = game.draw
+
+        def slow_draw():
+            time.sleep(slow_ms / 1000)
+            draw()
+
+        game.draw = slow_draw
+        done = threading.Event()
+
+        # Stamp keys with when they were pressed rather than when the game saw them
+        posted = deque()
+        push = game.inputs.push
+        game.inputs.push = lambda direction: push(direction, posted.popleft())
+
+        def press_keys():
+            # A key every 20-120 ms, unrelated to the frame rate
+            rng = random.Random(0)
+            while not done.wait(rng.uniform(0.02, 0.12)):
+                posted.append(time.perf_counter())
+                pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=rng.choice(keys)))
+
+        presser = threading.Thread(target=press_keys, daemon=True)
+        presser.start()
+        start = time.perf_counter()
+        while time.perf_counter() - start < seconds:
+            if game.state != "PLAYING":
+                game.reset_game()
+                game.state = "PLAYING"
+            game.frame()
+        done.set()
+        presser.join()
+        return game.inputs
+
+    def ms(values, fraction):
+        return percentile(sorted(values), fraction) * 1000
+
+    print(f"input latency over {seconds:.0f} s per run (p50 / p90 / p99 ms)")
+    for slow_ms in (0, 20):
+        for paced in (False, True):
+            inputs = play(paced, slow_ms)
+            name = "paced" if paced else "clock.tick"
+            print(f"  draw +{slow_ms:2d} ms {name:10s} {len(inputs.to_update):4d} keys  "
+                  f"to update {ms(inputs.to_update, 0.5):5.1f} / {ms(inputs.to_update, 0.9):5.1f} / "
+                  f"{ms(inputs.to_update, 0.99):5.1f}  "
+                  f"to display {ms(inputs.to_display, 0.5):5.1f} / {ms(inputs.to_display, 0.9):5.1f} / "
+                  f"{ms(inputs.to_display, 0.99):5.1f}")
+
+def bench_brains(args):
+    """Measure the CPU time each ghost brain spends per decision in headless play"""
+    import random
+    from main import Game
+    from brains import BRAINS
+
+    game = Game()
+    game.ghost_brains = sorted(BRAINS)
+    game.reset_game()
+    game.state = "PLAYING"
+    rng = random.Random(0)
+    for tick in range(args.steps * args.runs):
+        if game.state != "PLAYING":
+            game.reset_game()
+            game.state = "PLAYING"
+        if tick % 16 == 0:
+            game.pacman.change_direction(rng.choice(["UP", "DOWN", "LEFT", "RIGHT"]))
+        game.update()
+
+    print(f"ghost brains over {args.steps * args.runs} ticks")
+    for name, stats in sorted(game.brains.stats.items()):
+        mean = stats.total_time / stats.decisions * 1e6 if stats.decisions else 0.0
+        print(f"  {name:8s} {stats.decisions:6d} decisions, mean {mean:5.1f} us, max {stats.max_time * 1e6:6.1f} us "
+              f"(budget {BRAINS[name].budget * 1e6:.0f} us), {stats.overruns} over budget")
+
+def bench_maze(args):
+    """Time building a map with the maze compiled from scratch, from the disk cache and from memory"""
+    import tempfile
+    import time
+    import levels
+    import maze
+    from map import Map
+
+    def build_maps(count):
+        start = time.perf_counter()
+        for _ in range(count):
+            for layout in levels.LAYOUTS:
+                game_map = Map(40, layout)
+                game_map.build_distances()
+        return (time.perf_counter() - start) / (count * len(levels.LAYOUTS))
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cold = []
+        disk = []
+        for _ in range(args.runs):
+            # Nothing cached anywhere: compile every layout
+            maze.clear_cache(disk=True, cache_dir=cache_dir)
+            start = time.perf_counter()
+            for layout in levels.LAYOUTS:
+                maze.compile_maze(layout, cache_dir)
+            cold.append((time.perf_counter() - start) / len(levels.LAYOUTS))
+
+            # New process: only the files are there
+            maze.clear_cache()
+            start = time.perf_counter()
+            for layout in levels.LAYOUTS:
+                maze.compile_maze(layout, cache_dir)
+            disk.append((time.perf_counter() - start) / len(levels.LAYOUTS))
+
+    maze.clear_cache()
+    first = build_maps(1)
+    warm = build_maps(args.runs * 20)
+    print(f"maze compile per layout: cold {statistics.median(cold) * 1000:.2f} ms, "
+          f"from disk cache {statistics.median(disk) * 1000:.2f} ms")
+    print(f"Map() with distances per layout: first in a process {first * 1000:.2f} ms, "
+          f"cached in memory {warm * 1000:.3f} ms")
+
+def bench_viewport(args):
+    """Time drawing at the logical resolution and scaling to windows from 800x600 to 4K"""
+    import random
+    import time
+    import pygame
+    from main import Game, SCREEN_WIDTH, SCREEN_HEIGHT
+    from viewport import Viewport
+
+    pygame.display.init()
+    pygame.font.init()
+    frames = args.steps // 100
+    print(f"{frames} frames of play per window size, draw + scale ms per frame (median of {args.runs})")
+    for size in ((800, 600), (1280, 720), (1920, 1080), (2560, 1440), (3840, 2160)):
+        for smooth in (False, True):
+            window = pygame.Surface(size)
+            viewport = Viewport(window, (SCREEN_WIDTH, SCREEN_HEIGHT), smooth)
+            game = Game(viewport.target)
+            game.viewport = viewport
+            draws = []
+            scales = []
+            for _ in range(args.runs):
+                game.rng.seed(0)
+                game.reset_game()
+                game.state = "PLAYING"
+                rng = random.Random(0)
+                draw_time = scale_time = 0.0
+                for frame in range(frames):
+                    if frame % 16 == 0:
+                        game.pacman.change_direction(rng.choice(["UP", "DOWN", "LEFT", "RIGHT"]))
+                    game.update()
+                    if game.state != "PLAYING":
+                        game.reset_game()
+                        game.state = "PLAYING"
+                    start = time.perf_counter()
+                    game.draw()
+                    middle = time.perf_counter()
+                    viewport.present()
+                    end = time.perf_counter()
+                    draw_time += middle - start
+                    scale_time += end - middle
+                draws.append(draw_time / frames)
+                scales.append(scale_time / frames)
+            draw = statistics.median(draws) * 1000
+            scale = statistics.median(scales) * 1000
+            mode = "smooth" if smooth else "nearest"
+            print(f"  {size[0]:4d}x{size[1]:<4d} {mode:7s} draw {draw:5.2f} + scale {scale:5.2f} = {draw + scale:5.2f} ms "
+                  f"(frame {viewport.rect.width}x{viewport.rect.height})")
+
+def bench_monitor(args):
+    """Compare the games' total tick rate with and without the mosaic monitor drawing them"""
+    import time
+    import pygame
+    from monitor import Monitor, WINDOW_SIZE
+
+    games = 16
+    monitor = Monitor(games)
+    monitor.start()
+    try:
+        pygame.display.init()
+        pygame.font.init()
+        monitor.open(pygame.display.set_mode(WINDOW_SIZE))
+        time.sleep(3)  # Let the workers start up
+
+        def rate(watch, seconds=2.0):
+            ticks = monitor.throughput()
+            start = time.perf_counter()
+            if watch:
+                monitor.run(seconds)
+            else:
+                time.sleep(seconds)
+            return (monitor.throughput() - ticks) / (time.perf_counter() - start)
+
+        alone = []
+        watched = []
+        for _ in range(args.runs):
+            alone.append(rate(False))
+            watched.append(rate(True))
+    finally:
+        monitor.close()
+
+    print(f"{games} games on {monitor.workers} worker processes ({os.cpu_count()} cores)")
+    print(f"  unwatched {statistics.median(alone):9.0f} ticks/s")
+    print(f"  watched   {statistics.median(watched):9.0f} ticks/s")
+    print(f"  {monitor.report()}")
+
+BENCHMARKS = {
+    "startup": bench_startup,
+    "env": bench_env,
+    "pixels": bench_pixels,
+    "autopilot": bench_autopilot,
+    "snapshot": bench_snapshot,
+    "rollout": bench_rollout,
+    "netplay": bench_netplay,
+    "capture": bench_capture,
+    "levels": bench_levels,
+    "fastforward": bench_fastforward,
+    "pacing": bench_pacing,
+    "input": bench_input,
+    "brains": bench_brains,
+    "maze": bench_maze,
+    "viewport": bench_viewport,
+    "monitor": bench_monitor,
+}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("name", choices=sorted(BENCHMARKS))
+    parser.add_argument("--runs", type=int, default=5, help="repetitions to take the median of")
+    parser.add_argument("--steps", type=int, default=20000, help="steps per run for simulation benchmarks")
+    parser.add_argument("--budget", type=float, default=1.0, help="planning budget per tick in milliseconds")
+    args = parser.parse_args()
+    BENCHMARKS[args.name](args)
+
+if __name__ == "__main__":
+    main()
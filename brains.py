@@ -0,0 +1,230 @@
+"""Ghost brains: pluggable strategies that pick a ghost's direction.
+
+A brain is a function registered under a name with @register. Whenever a
+ghost reaches a cell center outside power mode, its brain gets a
+read-only BrainView and returns one of view.exits:
+
+    import brains
+
+    @brains.register("shy", budget_ms=0.5)
+    def shy(view):
+        return max(view.exits, key=lambda d: view.distance_after(d, view.pacman))
+
+A ghost's personality is the name of its brain. A BrainMonitor times every
+decision, warns when a brain goes over its budget and falls back to
+FALLBACK for a decision that fails, or for good after a brain keeps
+overrunning.
+"""
+import math
+import time
+import warnings
+import weakref
+from collections import namedtuple
+
+# Decision budget
+DEFAULT_BUDGET_MS = 1.0  # CPU time a brain may spend on one decision
+STRIKES = 3  # Overruns in a row before a brain is replaced by the fallback
+FALLBACK = "chase"  # Cheap brain used when another one fails
+
+DIRECTION_VECTORS = {"UP": (0, -1), "DOWN": (0, 1), "LEFT": (-1, 0), "RIGHT": (1, 0)}
+
+# A registered brain
+Brain = namedtuple("Brain", "name choose budget")
+
+# Pac-Man or a ghost as brains see them
+Entity = namedtuple("Entity", "x y direction")
+
+BRAINS = {}
+
+def register(name, budget_ms=DEFAULT_BUDGET_MS):
+    """Decorator registering a function(view) -> direction as a ghost brain"""
+    def decorator(choose):
+        BRAINS[name] = Brain(name, choose, budget_ms / 1000.0)
+        return choose
+    return decorator
+
+class MazeView:
+    def __init__(self, game_map):
+        """Walls and exits of a map, computed once and shared by every decision"""
+        self.width = game_map.width
+        self.height = game_map.height
+        self.cell_size = game_map.cell_size
+        self._map = game_map
+        self.walls = frozenset(game_map.compiled.walls)
+        # Open directions out of every open cell, in get_valid_directions order
+        self._exits = game_map.compiled.exits
+
+    def is_open(self, cell):
+        """Check if a grid cell is inside the maze and not a wall"""
+        return cell in self._exits
+
+    def exits(self, cell):
+        """Directions leading out of an open cell into open cells"""
+        return self._exits.get(cell, ())
+
+    def distance(self, start, end):
+        """Shortest path in cells between two open cells (None if unreachable)"""
+        return self._map.distance(start, end)
+
+# One MazeView per map, dropped along with the map
+_maze_views = weakref.WeakKeyDictionary()
+
+def maze_view(game_map):
+    """Shared read-only view of a map's maze"""
+    view = _maze_views.get(game_map)
+    if view is None:
+        view = _maze_views[game_map] = MazeView(game_map)
+    return view
+
+class BrainView:
+    __slots__ = ("maze", "position", "cell", "direction", "exits", "pacman", "rng", "_others", "_ghosts")
+
+    def __init__(self, maze, position, direction, exits, pacman, rng, others=None):
+        """What a brain sees when its ghost is at a cell center
+
+        position is the ghost's pixel position (a cell center), exits the
+        directions it may take (not back the way it came unless that is
+        the only one) and rng the game's random generator, so games stay
+        reproducible. Other ghosts are only gathered if the brain asks.
+        """
+        self.maze = maze
+        self.position = position
+        self.cell = (int(position[0] // maze.cell_size), int(position[1] // maze.cell_size))
+        self.direction = direction
+        self.exits = exits
+        self.pacman = pacman
+        self.rng = rng
+        self._others = others
+        self._ghosts = None
+
+    @property
+    def ghosts(self):
+        """Every ghost (including this one) as Entity tuples"""
+        if self._ghosts is None:
+            others = self._others() if self._others is not None else ()
+            self._ghosts = tuple(Entity(ghost.x, ghost.y, ghost.direction) for ghost in others)
+        return self._ghosts
+
+    def distance_after(self, direction, target):
+        """Straight-line distance to a target (pixels) after one cell in a direction"""
+        dx, dy = DIRECTION_VECTORS[direction]
+        new_x = self.position[0] + dx * self.maze.cell_size
+        new_y = self.position[1] + dy * self.maze.cell_size
+        return math.sqrt((new_x - target[0])**2 + (new_y - target[1])**2)
+
+    def toward(self, target):
+        """Exit that gets closest to a target (pixels), the first one on ties"""
+        return min(self.exits, key=lambda direction: self.distance_after(direction, target))
+
+# Built-in brains (the original ghost personalities)
+
+@register("chase")
+def chase(view):
+    """Head straight for Pac-Man"""
+    return view.toward((view.pacman.x, view.pacman.y))
+
+@register("ambush")
+def ambush(view):
+    """Head for four cells ahead of Pac-Man"""
+    pacman = view.pacman
+    dx, dy = DIRECTION_VECTORS.get(pacman.direction, (0, 0))
+    cell_size = view.maze.cell_size
+    return view.toward((pacman.x + dx * 4 * cell_size, pacman.y + dy * 4 * cell_size))
+
+@register("random")
+def wander(view):
+    """Take a random exit"""
+    return view.rng.choice(view.exits)
+
+@register("patrol")
+def patrol(view):
+    """Head for the nearest corner that is not too close, else for Pac-Man"""
+    maze = view.maze
+    cell_size = maze.cell_size
+    corners = [
+        (cell_size * 1.5, cell_size * 1.5),
+        (cell_size * (maze.width - 1.5), cell_size * 1.5),
+        (cell_size * 1.5, cell_size * (maze.height - 1.5)),
+        (cell_size * (maze.width - 1.5), cell_size * (maze.height - 1.5))
+    ]
+
+    x, y = view.position
+    target = None
+    min_dist = float('inf')
+    for corner in corners:
+        dist = math.sqrt((x - corner[0])**2 + (y - corner[1])**2)
+        if dist < min_dist and dist > cell_size * 3:
+            min_dist = dist
+            target = corner
+
+    if target is None:
+        target = (view.pacman.x, view.pacman.y)
+    return view.toward(target)
+
+class BrainStats:
+    def __init__(self):
+        """Decision timing for one brain"""
+        self.decisions = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.overruns = 0
+        self.strikes = 0  # Overruns in a row
+        self.fallbacks = 0
+        self.benched = False  # Replaced by the fallback after too many strikes
+
+class BrainMonitor:
+    def __init__(self, fallback=FALLBACK):
+        """Time ghost brain decisions and keep slow or broken brains in check"""
+        self.fallback = fallback
+        self.stats = {}
+
+    def decide(self, name, view):
+        """Ask a brain for a direction, timing it and falling back if needed"""
+        brain = BRAINS[name]
+        stats = self.stats.get(name)
+        if stats is None:
+            stats = self.stats[name] = BrainStats()
+        if stats.benched:
+            stats.fallbacks += 1
+            return BRAINS[self.fallback].choose(view)
+
+        start = time.thread_time()
+        try:
+            direction = brain.choose(view)
+        except Exception as error:
+            warnings.warn(f"ghost brain {name!r} failed: {error!r}", RuntimeWarning)
+            direction = None
+        elapsed = time.thread_time() - start
+
+        stats.decisions += 1
+        stats.total_time += elapsed
+        stats.max_time = max(stats.max_time, elapsed)
+        if elapsed > brain.budget:
+            stats.overruns += 1
+            stats.strikes += 1
+            if stats.strikes >= STRIKES and name != self.fallback:
+                stats.benched = True
+                warnings.warn(f"ghost brain {name!r} went over its {brain.budget * 1000:.2f} ms budget "
+                              f"{STRIKES} times in a row; using {self.fallback!r} instead", RuntimeWarning)
+            elif stats.overruns == 1:
+                warnings.warn(f"ghost brain {name!r} took {elapsed * 1000:.2f} ms "
+                              f"(budget {brain.budget * 1000:.2f} ms)", RuntimeWarning)
+        else:
+            stats.strikes = 0
+
+        if direction not in view.exits:
+            stats.fallbacks += 1
+            direction = BRAINS[self.fallback].choose(view)
+        return direction
+
+    def report(self):
+        """Per-brain decision cost as a short text summary"""
+        parts = []
+        for name, stats in sorted(self.stats.items()):
+            mean = stats.total_time / stats.decisions * 1e6 if stats.decisions else 0.0
+            text = (f"{name} {stats.decisions} decisions, mean {mean:.1f} us, max {stats.max_time * 1e6:.1f} us, "
+                    f"{stats.overruns} over budget, {stats.fallbacks} fallbacks")
+            if stats.benched:
+                text += " (benched)"
+            parts.append(text)
+        return "ghost brains: " + ("; ".join(parts) if parts else "no decisions")
@@ -0,0 +1,104 @@
+import os
+import queue
+import threading
+import pygame
+
+class FrameRecorder:
+    def __init__(self, path, every=1, fmt="png", pool_size=8):
+        """Record frames on a background writer thread
+
+        Every Nth captured frame is copied into one of pool_size reusable
+        buffers and handed to the writer thread, which saves it as a PNG
+        sequence (path is a directory) or appends it to a raw RGB stream
+        (path is a file). When every buffer is still waiting to be written
+        the new frame is dropped, so capturing never blocks the game loop.
+        """
+        if fmt not in ("png", "raw"):
+            raise ValueError(f"Unknown capture format: {fmt}")
+        self.path = path
+        self.every = max(1, every)
+        self.fmt = fmt
+        self.pool_size = pool_size
+        self.frame = 0
+        self.captured = 0
+        self.dropped = 0
+        self.size = None
+        self.error = None  # What stopped the writer (e.g. a full disk)
+
+        self.free = queue.Queue()  # Buffers ready to be filled
+        self.pending = queue.Queue()  # Filled buffers waiting for the writer
+        self.buffers_created = 0
+
+        if fmt == "png":
+            os.makedirs(path, exist_ok=True)
+            self.stream = None
+        else:
+            self.stream = open(path, "wb")
+
+        self.thread = threading.Thread(target=self._write_frames, name="frame-writer", daemon=True)
+        self.thread.start()
+
+    def capture(self, surface):
+        """Copy a frame for writing (call once per frame after drawing)"""
+        self.frame += 1
+        if (self.frame - 1) % self.every or self.error is not None:
+            return
+
+        try:
+            buffer = self.free.get_nowait()
+        except queue.Empty:
+            if self.buffers_created >= self.pool_size:
+                self.dropped += 1
+                return
+            # Grow the pool lazily up to its size, matching the screen format
+            buffer = pygame.Surface(surface.get_size(), 0, surface)
+            self.buffers_created += 1
+            self.size = surface.get_size()
+
+        buffer.blit(surface, (0, 0))
+        self.pending.put((self.frame, buffer))
+
+    def _write_frames(self):
+        """Writer thread: encode queued frames and recycle their buffers"""
+        while True:
+            item = self.pending.get()
+            if item is None:
+                break
+            frame, buffer = item
+            try:
+                if self.fmt == "png":
+                    pygame.image.save(buffer, os.path.join(self.path, f"frame_{frame:06d}.png"))
+                else:
+                    self.stream.write(pygame.image.tobytes(buffer, "RGB"))
+            except (OSError, pygame.error) as error:
+                # Stop recording; close() raises the error
+                self.error = error
+                break
+            self.captured += 1
+            self.free.put(buffer)
+
+    def close(self):
+        """Write out everything still queued and stop the writer thread
+
+        Raises the error that stopped the writer, if writing failed.
+        """
+        self.pending.put(None)
+        self.thread.join()
+        if self.stream is not None:
+            try:
+                self.stream.close()
+            except OSError as error:
+                if self.error is None:
+                    self.error = error
+        if self.error is not None:
+            raise self.error
+
+    def report(self):
+        """Capture statistics as a short text summary"""
+        text = f"capture: {self.captured} frames written, {self.dropped} dropped"
+        if self.error is not None:
+            text += f", FAILED: {self.error}"
+        if self.fmt == "raw" and self.size is not None:
+            width, height = self.size
+            text += f" (raw RGB {width}x{height}, e.g. ffmpeg -f rawvideo -pix_fmt rgb24 -s {width}x{height})"
+        return text
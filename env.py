@@ -0,0 +1,142 @@
+import numpy as np
+
+from main import Game
+
+# Actions: index into this list (0 keeps the current direction)
+ACTIONS = [None, "UP", "DOWN", "LEFT", "RIGHT"]
+
+# Observation channels
+WALLS = 0
+PELLETS = 1  # 1 = pellet, 2 = power pellet
+GHOSTS = 2  # 1 = ghost, 2 = frightened ghost
+PACMAN = 3
+NUM_CHANNELS = 4
+
+# Layout value -> pellet channel value
+PELLET_VALUES = {2: 1, 3: 2}
+
+class PacManEnv:
+    def __init__(self, frame_skip=1, max_steps=None):
+        """Headless Pac-Man environment with a Gym-style reset/step API
+
+        frame_skip game updates are run per step and max_steps (if set)
+        truncates long episodes.
+        """
+        self.game = Game()
+        self.frame_skip = frame_skip
+        self.max_steps = max_steps
+        self.steps = 0
+
+        # Observation buffer, updated in place and returned by every call
+        game_map = self.game.map
+        self.obs = np.zeros((NUM_CHANNELS, game_map.height, game_map.width), dtype=np.uint8)
+        self.pacman_cell = None
+        self.ghost_cells = []
+        self.game_map = None
+
+    @property
+    def num_actions(self):
+        """Number of discrete actions"""
+        return len(ACTIONS)
+
+    def reset(self, seed=None):
+        """Start a new episode and return (observation, info)"""
+        game = self.game
+        if seed is not None:
+            game.rng.seed(seed)
+        game.reset_game()
+        game.state = "PLAYING"
+        self.steps = 0
+        self._build_static()
+        self.obs[GHOSTS] = 0
+        self.obs[PACMAN] = 0
+        self.pacman_cell = None
+        self.ghost_cells = []
+        self._update_entities()
+        return self.obs, self._info()
+
+    def _build_static(self):
+        """Fill the wall and pellet channels from the map (only on a new map)"""
+        game_map = self.game.map
+        self.game_map = game_map
+        walls = self.obs[WALLS]
+        pellets = self.obs[PELLETS]
+        for y, row in enumerate(game_map.layout):
+            for x, value in enumerate(row):
+                walls[y, x] = value == 1
+                pellets[y, x] = PELLET_VALUES.get(value, 0)
+
+    def step(self, action):
+        """Apply an action and return (observation, reward, terminated, truncated, info)
+
+        The returned observation is the same array every time; copy it if
+        you need to keep it around.
+        """
+        game = self.game
+        direction = ACTIONS[action]
+        if direction is not None:
+            game.pacman.change_direction(direction)
+
+        score = game.score
+        pellet_bits = game.map.pellet_bits
+
+        # All skipped frames at once (fast-forwarded when frame_skip > 1)
+        game.update(self.frame_skip)
+
+        if game.map is not self.game_map:
+            # Level cleared: a new maze (all pellets back)
+            self._build_static()
+        else:
+            # Clear the pellets eaten during the step
+            pellets = self.obs[PELLETS]
+            width = game.map.width
+            eaten = pellet_bits & ~game.map.pellet_bits
+            while eaten:
+                index = eaten.bit_length() - 1
+                y, x = divmod(index, width)
+                pellets[y, x] = 0
+                eaten &= ~(1 << index)
+
+        self._update_entities()
+        self.steps += 1
+
+        reward = game.score - score  # 10 per pellet, 50 per power pellet, 200 per ghost
+        terminated = game.state in ("GAME_OVER", "WIN")
+        truncated = self.max_steps is not None and self.steps >= self.max_steps
+        return self.obs, reward, terminated, truncated, self._info()
+
+    def _update_entities(self):
+        """Move the Pac-Man and ghost markers to their current cells"""
+        game = self.game
+        cell_size = game.map.cell_size
+        ghosts = self.obs[GHOSTS]
+        pacman = self.obs[PACMAN]
+
+        # Clear last step's markers instead of zeroing the whole channel
+        for x, y in self.ghost_cells:
+            ghosts[y, x] = 0
+        if self.pacman_cell is not None:
+            x, y = self.pacman_cell
+            pacman[y, x] = 0
+
+        self.ghost_cells = []
+        for ghost in game.ghosts:
+            x, y = self._cell(ghost.x, ghost.y, cell_size)
+            ghosts[y, x] = max(ghosts[y, x], 2 if ghost.frightened else 1)
+            self.ghost_cells.append((x, y))
+
+        self.pacman_cell = self._cell(game.pacman.x, game.pacman.y, cell_size)
+        x, y = self.pacman_cell
+        pacman[y, x] = 1
+
+    def _cell(self, x, y, cell_size):
+        """Grid cell of a pixel position, clamped to the map"""
+        game_map = self.game.map
+        grid_x = min(max(int(x // cell_size), 0), game_map.width - 1)
+        grid_y = min(max(int(y // cell_size), 0), game_map.height - 1)
+        return grid_x, grid_y
+
+    def _info(self):
+        """Extra episode information"""
+        game = self.game
+        return {"score": game.score, "lives": game.lives, "level": game.level, "state": game.state}
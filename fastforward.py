@@ -0,0 +1,214 @@
+"""Fast-forward a game over many ticks at once.
+
+Most ticks only move everyone straight on. So Pac-Man, each ghost and
+each ghost's contact check get a full update only on the ticks where
+something can happen to them: a cell center or a new cell (see
+PacMan.quiet_ticks and Ghost.quiet_ticks), the end of power mode, or the
+two getting close enough to touch. In between, an entity is caught up in
+one go when its state is needed. Ticks are still processed in order with
+the same phases as Game.tick, so the result is exactly the same as
+updating tick by tick.
+"""
+
+NEVER = float('inf')
+
+def run(game, steps):
+    """Advance a game by steps ticks"""
+    if game.state == "PLAYING":
+        FastForward(game, steps).run()
+
+class FastForward:
+    def __init__(self, game, steps):
+        """Bookkeeping for fast-forwarding a game by steps ticks"""
+        self.game = game
+        self.steps = steps
+        self.track(0)
+
+    def track(self, tick):
+        """Start following the game's current entities from a tick"""
+        game = self.game
+        count = len(game.ghosts)
+        # Ticks already applied to each entity and the next tick each one
+        # needs a full update (or a contact check)
+        self.pacman_at = tick
+        self.ghost_at = [tick] * count
+        self.power_at = tick
+        self.pacman_moving = True
+        self.pacman_next = tick + self.pacman_quiet(tick)
+        self.ghost_next = [tick + self.ghost_quiet(ghost, tick) for ghost in game.ghosts]
+        self.contact_next = [tick + self.contact_safe(ghost) for ghost in game.ghosts]
+        self.power_end = self.power_end_tick()
+
+    def pacman_quiet(self, tick):
+        """Ticks from tick on that Pac-Man just moves straight on (or stands still)"""
+        game = self.game
+        pacman = game.pacman
+        self.pacman_moving = pacman.can_move(pacman.direction, game.map)
+        return pacman.quiet_ticks(game.map, self.steps - tick, stop_at_centers=game.autopilot is not None)
+
+    def ghost_quiet(self, ghost, tick):
+        """Ticks from tick on that a ghost just moves straight on"""
+        if ghost.frightened != self.game.power_mode:
+            return 0  # About to switch modes
+        return ghost.quiet_ticks(self.steps - tick)
+
+    def contact_safe(self, ghost):
+        """Ticks from now on in which a ghost cannot possibly touch Pac-Man
+
+        Their gap can shrink by at most both speeds per tick (twice the
+        ghost's, allowing for it snapping to a cell center), whichever
+        way either of them turns. A pixel of slack either way covers the
+        rounding of their rects.
+        """
+        pacman = self.game.pacman
+        gap = max(abs(ghost.x - pacman.x), abs(ghost.y - pacman.y))
+        reach = (pacman.rect.width + ghost.rect.width) / 2 + 2
+        closing = pacman.speed + 2 * ghost.speed
+        return max(0, int((gap - reach) // closing))
+
+    def power_end_tick(self):
+        """Tick on which power mode runs out"""
+        game = self.game
+        return self.power_at + game.power_timer - 1 if game.power_mode else NEVER
+
+    def near_power_pellet(self):
+        """Check if Pac-Man could reach a power pellet this tick"""
+        game_map = self.game.map
+        pacman = self.game.pacman
+        x = int(pacman.x // game_map.cell_size)
+        y = int(pacman.y // game_map.cell_size)
+        for dx, dy in ((0, 0), (0, -1), (0, 1), (-1, 0), (1, 0)):
+            if 0 <= x + dx < game_map.width and 0 <= y + dy < game_map.height:
+                if game_map.layout[y + dy][x + dx] == 3:
+                    return True
+        return False
+
+    def pacman_to(self, tick):
+        """Catch Pac-Man up to the start of a tick"""
+        if tick > self.pacman_at:
+            self.game.pacman.advance(tick - self.pacman_at, self.pacman_moving)
+            self.pacman_at = tick
+
+    def ghost_to(self, index, tick):
+        """Catch a ghost up to the start of a tick"""
+        if tick > self.ghost_at[index]:
+            self.game.ghosts[index].advance(tick - self.ghost_at[index], self.game.power_mode)
+            self.ghost_at[index] = tick
+
+    def power_to(self, tick):
+        """Catch the power mode timer up to the start of a tick"""
+        if self.game.power_mode:
+            self.game.power_timer -= tick - self.power_at
+        self.power_at = tick
+
+    def caught_up_ghosts(self):
+        """The ghosts as Game.tick would have them for the deciding ghost (for ghost brains)"""
+        index, tick = self.deciding
+        for other in range(len(self.game.ghosts)):
+            # Ghosts before it have had this tick, the rest have not
+            self.ghost_to(other, tick + 1 if other < index else tick)
+        return self.game.ghosts
+
+    def everything_to(self, tick):
+        """Catch every entity up to the start of a tick"""
+        self.pacman_to(tick)
+        self.power_to(tick)
+        for index in range(len(self.game.ghosts)):
+            self.ghost_to(index, tick)
+
+    def run(self):
+        """Process every tick where something happens, then catch everyone up"""
+        game = self.game
+        end = self.steps
+        while game.state == "PLAYING":
+            tick = min(self.pacman_next, self.power_end, min(self.ghost_next, default=NEVER),
+                       min(self.contact_next, default=NEVER))
+            if tick >= self.steps:
+                break
+            self.do_tick(tick)
+            end = tick + 1
+        if game.state == "PLAYING":
+            end = self.steps
+        self.everything_to(end)
+
+    def do_tick(self, tick):
+        """Run the phases of Game.tick that are due on a tick"""
+        game = self.game
+        pacman = game.pacman
+        everything = False  # Last pellet eaten: run the whole tick
+        pacman_start = None
+
+        # Pac-Man (the autopilot may look at everyone, and a power pellet
+        # changes the ghosts, so then catch everyone up first)
+        if self.pacman_next == tick:
+            if game.autopilot is not None or self.near_power_pellet():
+                self.everything_to(tick)
+            else:
+                self.pacman_to(tick)
+                self.power_to(tick)
+            power = (game.power_mode, game.power_timer)
+            pacman_start = game.update_pacman()
+            self.pacman_at = tick + 1
+            self.pacman_next = tick + 1 + self.pacman_quiet(tick + 1)
+            if (game.power_mode, game.power_timer) != power:
+                self.ghost_next = [tick] * len(game.ghosts)
+                self.power_end = self.power_end_tick()
+            everything = game.collected_pellets >= game.total_pellets
+
+        # Power mode timer
+        if everything or self.power_end == tick:
+            for index in range(len(game.ghosts)):
+                self.ghost_to(index, tick)
+            self.power_to(tick)
+            if game.update_power_timer():
+                self.ghost_next = [tick] * len(game.ghosts)
+            self.power_at = tick + 1
+            self.power_end = self.power_end_tick()
+
+        # Ghosts
+        died = False
+        for index, ghost in enumerate(game.ghosts):
+            full = everything or self.ghost_next[index] == tick
+            check = everything or self.contact_next[index] == tick
+            if not (full or check):
+                continue
+
+            self.pacman_to(tick + 1)
+            self.ghost_to(index, tick)
+            ghost_start = (ghost.x, ghost.y)
+            if full:
+                self.deciding = (index, tick)
+                ghost.update(game.map, pacman, game.power_mode, self.caught_up_ghosts)
+                self.ghost_next[index] = tick + 1 + self.ghost_quiet(ghost, tick + 1)
+            else:
+                ghost.advance(1, game.power_mode)
+            self.ghost_at[index] = tick + 1
+            if not check:
+                continue
+
+            if pacman_start is None:
+                # He moved straight on (or stood still) this tick
+                dx, dy = pacman.get_direction_vector(pacman.direction) if self.pacman_moving else (0, 0)
+                pacman_start = (pacman.x - dx * pacman.speed, pacman.y - dy * pacman.speed)
+            if not game.ghost_touches(ghost, pacman_start, ghost_start):
+                self.contact_next[index] = tick + 1 + self.contact_safe(ghost)
+                continue
+
+            # Ghosts before this one have had this tick, the rest have not
+            for other in range(len(game.ghosts)):
+                self.ghost_to(other, tick + 1 if other < index else tick)
+            if game.ghost_collision(ghost):
+                for other in range(index + 1, len(game.ghosts)):
+                    self.ghost_at[other] = tick + 1  # They sit this tick out
+                died = True
+                break
+            self.ghost_next[index] = tick + 1
+            self.contact_next[index] = tick + 1
+
+        # A new level or a lost life puts everyone somewhere new
+        level_map = game.map
+        if everything:
+            game.check_level_cleared()
+        if game.state == "PLAYING" and (died or game.map is not level_map):
+            self.everything_to(tick + 1)
+            self.track(tick + 1)
@@ -1,25 +1,75 @@
 import pygame
 import random
-import math
+import assets
+import brains
 
 # Colors
 BLUE = (0, 0, 255)
 WHITE = (255, 255, 255)
 
+# Sprite files for each ghost look
+GHOST_SPRITE_FILES = {
+    "normal": 'assets/images/ghost.png',
+    "frightened": 'assets/images/frightened_ghost.png',
+    "blink": 'assets/images/frightened_ghost.png',
+}
+
+# Loaded and tinted sprites keyed by (kind, size, color), shared by all ghosts
+_sprite_cache = {}
+
+def animation_cycle(speed):
+    """Ticks the body animation takes to go from frame 0 back to frame 0"""
+    frame, ticks = 0, 0
+    while frame < 2:
+        frame += speed
+        ticks += 1
+    return ticks
+
+def get_ghost_sprite(kind, size, color=None):
+    """Get a scaled (and optionally tinted) ghost sprite, building it only once"""
+    key = (kind, size, color)
+    sprite = _sprite_cache.get(key)
+    if sprite is not None:
+        return sprite
+    
+    base_key = (kind, size, None)
+    base = _sprite_cache.get(base_key)
+    if base is None:
+        base = assets.load_image(GHOST_SPRITE_FILES[kind])
+        base = pygame.transform.scale(base, (size, size))
+        if kind == "blink":
+            # Washed-out white flash used when frightened mode is about to end
+            base.fill((160, 160, 160), special_flags=pygame.BLEND_RGB_ADD)
+        _sprite_cache[base_key] = base
+    
+    if color is None:
+        return base
+    
+    # Tint a copy with the ghost's color
+    sprite = base.copy()
+    sprite.fill(color, special_flags=pygame.BLEND_MULT)
+    _sprite_cache[key] = sprite
+    return sprite
+
 class Ghost:
-    def __init__(self, start_pos, cell_size, color, personality):
+    def __init__(self, start_pos, cell_size, color, personality, rng=None):
         """Initialize a ghost with starting position and behavior type"""
+        self.rng = rng if rng is not None else random  # Source of random choices
         self.cell_size = cell_size
         self.radius = int(cell_size * 0.4)
         self.x, self.y = start_pos
         self.color = color
-        self.personality = personality  # chase, ambush, random, patrol
-        self.direction = random.choice(["UP", "DOWN", "LEFT", "RIGHT"])
+        if personality not in brains.BRAINS:
+            raise ValueError(f"Unknown ghost brain: {personality}")
+        self.personality = personality  # Name of its brain: chase, ambush, random, patrol (see brains.py)
+        self.monitor = None  # BrainMonitor timing the brain's decisions (set by Game)
+        self.direction = self.rng.choice(["UP", "DOWN", "LEFT", "RIGHT"])
         self.speed = 1.5
         self.frightened = False
         self.frightened_timer = 0
         self.animation_frame = 0
         self.animation_speed = 0.2
+        self.animation_cycle = animation_cycle(self.animation_speed)
         
         # Create rect for collision detection
         self.rect = pygame.Rect(
@@ -29,20 +79,31 @@ class Ghost:
             self.radius * 2
         )
         
-        # Try to load ghost sprites
+        # Try to load ghost sprites (tinted variants are built once and shared)
         try:
-            self.sprite = pygame.image.load('assets/images/ghost.png')
-            self.sprite = pygame.transform.scale(self.sprite, (self.radius * 2, self.radius * 2))
-            self.frightened_sprite = pygame.image.load('assets/images/frightened_ghost.png')
-            self.frightened_sprite = pygame.transform.scale(
-                self.frightened_sprite, (self.radius * 2, self.radius * 2)
-            )
+            self.sprite = get_ghost_sprite("normal", self.radius * 2, self.color)
+            self.frightened_sprite = get_ghost_sprite("frightened", self.radius * 2)
+            self.blink_sprite = get_ghost_sprite("blink", self.radius * 2)
             self.has_sprites = True
         except:
             self.has_sprites = False
     
-    def update(self, game_map, pacman, power_mode):
-        """Update ghost position and behavior"""
+    def frighten(self, duration):
+        """Make the ghost frightened for the given number of frames"""
+        self.frightened = True
+        self.frightened_timer = duration
+    
+    def is_blinking(self):
+        """Check if the frightened sprite should flash (last 3 seconds of power mode)"""
+        return self.frightened_timer < 3 * 60 and self.frightened_timer % 30 > 15
+    
+    def update(self, game_map, pacman, power_mode, ghosts=None):
+        """Update ghost position and behavior (ghosts returns every ghost, for brains that look)"""
+        # Count down frightened time (keeps running after being eaten so the
+        # ghost blinks in sync with the others if it gets frightened again)
+        if self.frightened_timer > 0:
+            self.frightened_timer -= 1
+        
         # Update frightened state
         if power_mode and not self.frightened:
             self.frightened = True
@@ -50,31 +111,84 @@ class Ghost:
             self.reverse_direction()
         elif not power_mode:
             self.frightened = False
+            self.frightened_timer = 0
         
         # Decide movement direction
         if self.frightened:
             self.move_frightened(game_map)
         else:
-            self.move_normal(game_map, pacman)
+            self.move_normal(game_map, pacman, ghosts)
         
-        # Update animation
-        self.animation_frame += self.animation_speed
-        if self.animation_frame >= 2:
-            self.animation_frame = 0
+        self.animate()
     
-    def move_normal(self, game_map, pacman):
+    def animate(self, ticks=1):
+        """Advance the body animation by some ticks"""
+        while ticks > 0:
+            ticks -= 1
+            self.animation_frame += self.animation_speed
+            if self.animation_frame >= 2:
+                self.animation_frame = 0
+                # Back at frame 0 the animation repeats, so skip whole cycles
+                ticks %= self.animation_cycle
+    
+    def step_size(self):
+        """Distance moved per tick (half speed when frightened)"""
+        return self.speed * 0.5 if self.frightened else self.speed
+    
+    def near_center(self, x, y):
+        """Check if a position is within one step of its cell center (where ghosts decide)"""
+        grid_x = x // self.cell_size
+        grid_y = y // self.cell_size
+        step = self.step_size()
+        return (
+            abs(x - (grid_x * self.cell_size + self.cell_size // 2)) < step and
+            abs(y - (grid_y * self.cell_size + self.cell_size // 2)) < step
+        )
+    
+    def quiet_ticks(self, limit):
+        """Ticks (up to limit) before the ghost reaches its next decision point"""
+        if self.near_center(self.x, self.y):
+            return 0
+        dx, dy = self.get_direction_vector(self.direction)
+        if dx == dy == 0:
+            return limit
+        
+        # Off center across the direction of travel: never near a center
+        step = self.step_size()
+        half = self.cell_size // 2
+        across = self.y if dx else self.x
+        if abs(across - (across // self.cell_size * self.cell_size + half)) >= step:
+            return limit
+        
+        # Distance to the next center ahead, which is reached (within one
+        # step) on the first tick the remaining distance drops below step
+        along = self.x if dx else self.y
+        offset = along - (along // self.cell_size * self.cell_size + half)
+        forward = dx or dy
+        if forward > 0:
+            distance = -offset if offset < 0 else self.cell_size - offset
+        else:
+            distance = offset if offset > 0 else self.cell_size + offset
+        return min(limit, int((distance - step) // step) + 1)
+    
+    def advance(self, ticks, power_mode):
+        """Do ticks straight-ahead updates at once (see quiet_ticks)"""
+        self.frightened_timer = max(0, self.frightened_timer - ticks) if power_mode else 0
+        dx, dy = self.get_direction_vector(self.direction)
+        step = self.step_size()
+        self.x += dx * step * ticks
+        self.y += dy * step * ticks
+        self.rect.center = (self.x, self.y)
+        self.animate(ticks)
+    
+    def move_normal(self, game_map, pacman, ghosts=None):
         """Move ghost based on its personality and Pac-Man's position"""
         # Get current grid position
         grid_x = self.x // self.cell_size
         grid_y = self.y // self.cell_size
         
         # Check if we're at a grid intersection (center of a cell)
-        at_intersection = (
-            abs(self.x - (grid_x * self.cell_size + self.cell_size // 2)) < self.speed and
-            abs(self.y - (grid_y * self.cell_size + self.cell_size // 2)) < self.speed
-        )
-        
-        if at_intersection:
+        if self.near_center(self.x, self.y):
             # Snap to grid center
             self.x = grid_x * self.cell_size + self.cell_size // 2
             self.y = grid_y * self.cell_size + self.cell_size // 2
@@ -86,46 +200,7 @@ class Ghost:
                 valid_directions.remove(opposite_direction)
             
             if valid_directions:
-                if self.personality == "chase":
-                    # Chase Pac-Man directly
-                    self.direction = self.get_direction_towards_target(
-                        (self.x, self.y), (pacman.x, pacman.y), valid_directions
-                    )
-                elif self.personality == "ambush":
-                    # Try to predict where Pac-Man is going
-                    target_x = pacman.x + pacman.get_direction_vector(pacman.direction)[0] * 4 * self.cell_size
-                    target_y = pacman.y + pacman.get_direction_vector(pacman.direction)[1] * 4 * self.cell_size
-                    self.direction = self.get_direction_towards_target(
-                        (self.x, self.y), (target_x, target_y), valid_directions
-                    )
-                elif self.personality == "random":
-                    # Move randomly
-                    self.direction = random.choice(valid_directions)
-                elif self.personality == "patrol":
-                    # Patrol between corners
-                    corners = [
-                        (self.cell_size * 1.5, self.cell_size * 1.5),
-                        (self.cell_size * (game_map.width - 1.5), self.cell_size * 1.5),
-                        (self.cell_size * 1.5, self.cell_size * (game_map.height - 1.5)),
-                        (self.cell_size * (game_map.width - 1.5), self.cell_size * (game_map.height - 1.5))
-                    ]
-                    
-                    # Find the nearest corner that's not too close
-                    target = None
-                    min_dist = float('inf')
-                    for corner in corners:
-                        dist = math.sqrt((self.x - corner[0])**2 + (self.y - corner[1])**2)
-                        if dist < min_dist and dist > self.cell_size * 3:
-                            min_dist = dist
-                            target = corner
-                    
-                    # If no good corner found, chase Pac-Man
-                    if target is None:
-                        target = (pacman.x, pacman.y)
-                    
-                    self.direction = self.get_direction_towards_target(
-                        (self.x, self.y), target, valid_directions
-                    )
+                self.direction = self.choose_direction(game_map, pacman, valid_directions, ghosts)
         
         # Move in the current direction
         dx, dy = self.get_direction_vector(self.direction)
@@ -135,19 +210,25 @@ class Ghost:
         # Update rect position
         self.rect.center = (self.x, self.y)
     
+    def choose_direction(self, game_map, pacman, valid_directions, ghosts=None):
+        """Ask the ghost's brain which way to go from a cell center"""
+        view = brains.BrainView(
+            brains.maze_view(game_map), (self.x, self.y), self.direction, tuple(valid_directions),
+            brains.Entity(pacman.x, pacman.y, pacman.direction), self.rng, ghosts
+        )
+        if self.monitor is not None:
+            return self.monitor.decide(self.personality, view)
+        return brains.BRAINS[self.personality].choose(view)
+    
     def move_frightened(self, game_map):
         """Move ghost in frightened mode (random movement)"""
         # Get current grid position
         grid_x = self.x // self.cell_size
         grid_y = self.y // self.cell_size
         
-        # Check if we're at a grid intersection
-        at_intersection = (
-            abs(self.x - (grid_x * self.cell_size + self.cell_size // 2)) < self.speed and
-            abs(self.y - (grid_y * self.cell_size + self.cell_size // 2)) < self.speed
-        )
-        
-        if at_intersection:
+        # Check if we're at a grid intersection (within one half-speed step,
+        # otherwise the ghost snaps back to the center every tick)
+        if self.near_center(self.x, self.y):
             # Snap to grid center
             self.x = grid_x * self.cell_size + self.cell_size // 2
             self.y = grid_y * self.cell_size + self.cell_size // 2
@@ -159,12 +240,12 @@ class Ghost:
                 valid_directions.remove(opposite_direction)
             
             if valid_directions:
-                self.direction = random.choice(valid_directions)
+                self.direction = self.rng.choice(valid_directions)
         
         # Move in the current direction at reduced speed
         dx, dy = self.get_direction_vector(self.direction)
-        self.x += dx * (self.speed * 0.5)  # Slower when frightened
-        self.y += dy * (self.speed * 0.5)
+        self.x += dx * self.step_size()  # Slower when frightened
+        self.y += dy * self.step_size()
         
         # Update rect position
         self.rect.center = (self.x, self.y)
@@ -197,54 +278,35 @@ class Ghost:
         """Reverse the current direction"""
         self.direction = self.get_opposite_direction(self.direction)
     
-    def get_direction_towards_target(self, current_pos, target_pos, valid_directions):
-        """Get the best direction to move towards a target"""
-        best_direction = None
-        min_distance = float('inf')
-        
-        for direction in valid_directions:
-            # Calculate new position if we move in this direction
-            dx, dy = self.get_direction_vector(direction)
-            new_x = current_pos[0] + dx * self.cell_size
-            new_y = current_pos[1] + dy * self.cell_size
-            
-            # Calculate distance to target from this new position
-            distance = math.sqrt((new_x - target_pos[0])**2 + (new_y - target_pos[1])**2)
-            
-            if distance < min_distance:
-                min_distance = distance
-                best_direction = direction
-        
-        return best_direction if best_direction else random.choice(valid_directions)
-    
     def reset(self, start_pos):
         """Reset ghost to starting position"""
         self.x, self.y = start_pos
-        self.direction = random.choice(["UP", "DOWN", "LEFT", "RIGHT"])
+        self.direction = self.rng.choice(["UP", "DOWN", "LEFT", "RIGHT"])
         self.frightened = False
         self.rect.center = (self.x, self.y)
     
     def draw(self, surface):
         """Draw the ghost on the screen"""
+        blinking = self.frightened and self.is_blinking()
+        
         if self.has_sprites:
-            # Draw sprite based on state
-            sprite = self.frightened_sprite if self.frightened else self.sprite
-            sprite_rect = sprite.get_rect(center=(self.x, self.y))
-            
-            # Tint the sprite with the ghost's color if not frightened
+            # Draw the pre-tinted sprite for the current state
             if not self.frightened:
-                tinted_sprite = sprite.copy()
-                tinted_sprite.fill(self.color, special_flags=pygame.BLEND_MULT)
-                surface.blit(tinted_sprite, sprite_rect)
+                sprite = self.sprite
+            elif blinking:
+                sprite = self.blink_sprite
             else:
-                # Blinking effect when frightened mode is about to end
-                if self.frightened_timer < 3 * 60 and self.frightened_timer % 30 > 15:
-                    surface.blit(sprite, sprite_rect)
-                else:
-                    surface.blit(sprite, sprite_rect)
+                sprite = self.frightened_sprite
+            sprite_rect = sprite.get_rect(center=(self.x, self.y))
+            surface.blit(sprite, sprite_rect)
         else:
             # Draw ghost as a simple shape
-            ghost_color = BLUE if self.frightened else self.color
+            if not self.frightened:
+                ghost_color = self.color
+            elif blinking:
+                ghost_color = WHITE
+            else:
+                ghost_color = BLUE
             
             # Draw ghost body (circle with rectangular bottom)
             pygame.draw.circle(
@@ -0,0 +1,75 @@
+import math
+import time
+from collections import deque
+
+from pygame.locals import K_UP, K_DOWN, K_LEFT, K_RIGHT
+
+# Arrow keys and the directions they steer in
+KEY_DIRECTIONS = {K_UP: "UP", K_DOWN: "DOWN", K_LEFT: "LEFT", K_RIGHT: "RIGHT"}
+
+def percentile(values, fraction):
+    """Value below which a fraction of the sorted values lie (nearest rank)"""
+    if not values:
+        return 0.0
+    return values[max(0, math.ceil(fraction * len(values)) - 1)]
+
+class InputQueue:
+    def __init__(self, clock=time.perf_counter):
+        """Timestamp steering input and apply it at the tick it arrived for
+
+        Directions are stamped when the game first sees them (pygame does
+        not keep the time of the key press itself) and handed to Pac-Man
+        just before the first tick scheduled at or after that time. The
+        time until that tick runs and until the next frame is shown are
+        recorded as latencies.
+        """
+        self.clock = clock
+        self.pending = deque()  # (timestamp, direction) not applied yet
+        self.undisplayed = []  # Timestamps of applied input not on screen yet
+
+        # Stats (seconds)
+        self.to_update = []
+        self.to_display = []
+
+    def push(self, direction, timestamp=None):
+        """Queue a direction, stamped now unless given"""
+        self.pending.append((self.clock() if timestamp is None else timestamp, direction))
+
+    def next_arrival(self):
+        """Timestamp of the oldest queued direction (None if there is none)"""
+        return self.pending[0][0] if self.pending else None
+
+    def apply_due(self, pacman, tick_time=None):
+        """Steer Pac-Man with everything that arrived by a tick's scheduled time (None: everything)"""
+        now = self.clock()
+        while self.pending and (tick_time is None or self.pending[0][0] <= tick_time):
+            timestamp, direction = self.pending.popleft()
+            pacman.change_direction(direction)
+            self.to_update.append(now - timestamp)
+            self.undisplayed.append(timestamp)
+
+    def waiting_for_display(self):
+        """Check if applied input has not been shown yet"""
+        return bool(self.undisplayed)
+
+    def displayed(self):
+        """Record that a frame showing every applied input was just flipped"""
+        now = self.clock()
+        for timestamp in self.undisplayed:
+            self.to_display.append(now - timestamp)
+        self.undisplayed.clear()
+
+    def clear(self):
+        """Drop queued input (for a new game or level)"""
+        self.pending.clear()
+        self.undisplayed.clear()
+
+    def report(self):
+        """Latency percentiles as a short text summary"""
+        parts = []
+        for name, values in (("input-to-update", self.to_update), ("input-to-display", self.to_display)):
+            values = sorted(values)
+            parts.append(f"{name} p50 {percentile(values, 0.5) * 1000:.1f} / "
+                         f"p90 {percentile(values, 0.9) * 1000:.1f} / "
+                         f"p99 {percentile(values, 0.99) * 1000:.1f} ms")
+        return f"input: {len(self.to_update)} turns, " + ", ".join(parts)
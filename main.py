@@ -1,16 +1,17 @@
 import pygame
+import argparse
 import sys
+import random
+import math
+import time
 from pygame.locals import *
 
-# Initialize pygame
-pygame.init()
-pygame.mixer.init()
-
 # Game Constants
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
 CELL_SIZE = 30
 FPS = 60
+TURN_BUFFER = 15  # Ticks a turn key waits for a corner when playing interactively
 
 # Colors
 BLACK = (0, 0, 0)
@@ -19,56 +20,126 @@ BLUE = (0, 0, 255)
 YELLOW = (255, 255, 0)
 RED = (255, 0, 0)
 
-# Set up the display
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption('Pac-Man')
-clock = pygame.time.Clock()
+# Ghosts: Red, Pink, Cyan, Orange with their behaviors
+GHOST_COLORS = [RED, (255, 192, 203), (0, 255, 255), (255, 165, 0)]
+GHOST_PERSONALITIES = ["chase", "ambush", "random", "patrol"]
 
 # Import game components
-from map import Map
+from map import Map, MapPreloader
 from pacman import PacMan
 from ghost import Ghost
 from ui import UI
+from assets import AssetLoader
+from autopilot import Autopilot
+from rollout import RolloutPlanner
+from snapshot import RewindBuffer
+from capture import FrameRecorder
+from pacing import FramePacer
+from viewport import Viewport
+from inputs import InputQueue, KEY_DIRECTIONS
+from brains import BrainMonitor, BRAINS
+from sweep import first_contact
+import fastforward
+import levels
+import maze
+
+def init_display(size=(SCREEN_WIDTH, SCREEN_HEIGHT), resizable=False):
+    """Open the game window, initializing only what the menu needs"""
+    # The mixer is brought up later by the asset loader thread
+    pygame.display.init()
+    pygame.font.init()
+    screen = pygame.display.set_mode(size, RESIZABLE if resizable else 0)
+    pygame.display.set_caption('Pac-Man')
+    return screen
+
+def window_size(text):
+    """Parse a WIDTHxHEIGHT window size argument"""
+    try:
+        width, height = (int(part) for part in text.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected WIDTHxHEIGHT, got {text!r}")
+    if width <= 0 or height <= 0:
+        raise argparse.ArgumentTypeError(f"window size must be positive, got {text!r}")
+    return (width, height)
 
 class Game:
-    def __init__(self):
+    def __init__(self, screen=None, assets=None):
+        """Create a game drawing to screen (None runs headless) with sounds from assets"""
         self.running = True
         self.state = "MENU"  # MENU, PLAYING, PAUSED, GAME_OVER, WIN
         self.score = 0
         self.lives = 3
         self.level = 1
-        self.ui = UI(screen)
+        self.screen = screen
+        self.assets = assets
+        self.clock = pygame.time.Clock()
+        self.rng = random.Random()  # Seed this for reproducible ghost behavior
+        self.autopilot = None  # Set to an Autopilot to let Pac-Man play himself
+        self.rewind = None  # Set to a RewindBuffer to allow rewinding with BACKSPACE
+        self.rewinding = False
+        self.recorder = None  # Set to a FrameRecorder to capture gameplay
+        self.max_level = None  # Win after clearing this level (None plays on forever)
+        self.pacer = None  # Set to a FramePacer to skip drawing instead of slowing down
+        self.inputs = None  # Set to an InputQueue to apply keys at the tick they arrived for
+        self.turn_buffer = None  # Ticks a turn waits for a cell center (None: turn wherever possible)
+        self.ghost_brains = list(GHOST_PERSONALITIES)  # Brain of each ghost (see brains.py)
+        self.brains = BrainMonitor()  # Times every ghost decision
+        self.viewport = None  # Set to a Viewport when screen is its logical render target
+        self.ui = UI(screen) if screen is not None else None
+        # Reject a broken level maze now rather than when it is reached
+        # (compiled mazes are cached, so this is nearly free)
+        for number, layout in enumerate(levels.LAYOUTS, 1):
+            try:
+                maze.compile_maze(layout)
+            except maze.MazeError as error:
+                raise maze.MazeError(f"level {number}: {error}") from error
+        # Windowed games build the next level in the background; headless
+        # ones only need the maze, which is quick to build on the spot
+        self.preloader = MapPreloader(CELL_SIZE) if screen is not None else None
         self.reset_game()
-        
-        # Try to load sounds
-        try:
-            self.chomp_sound = pygame.mixer.Sound('assets/sounds/chomp.wav')
-            self.death_sound = pygame.mixer.Sound('assets/sounds/death.wav')
-            self.eat_ghost_sound = pygame.mixer.Sound('assets/sounds/eat_ghost.wav')
-            self.power_pellet_sound = pygame.mixer.Sound('assets/sounds/power_pellet.wav')
-            self.has_sounds = True
-        except:
-            self.has_sounds = False
+    
+    def play_sound(self, name):
+        """Play a sound effect if sounds have finished loading"""
+        if self.assets is not None:
+            sound = self.assets.get_sound(name)
+            if sound is not None:
+                sound.play()
     
     def reset_game(self):
         """Reset the game state for a new game"""
         self.score = 0
         self.lives = 3
-        self.level = 1
-        self.map = Map(CELL_SIZE)
+        self.start_level(1)
+        
+        if self.inputs is not None:
+            self.inputs.clear()
+        
+        if self.rewind is not None:
+            self.rewind.clear()
+    
+    def start_level(self, level):
+        """Set up a level's maze, ghosts and difficulty (score and lives carry over)"""
+        self.level = level
+        if self.preloader is not None:
+            self.map = self.preloader.take(level)
+            self.preloader.start(level + 1)
+        else:
+            self.map = Map(CELL_SIZE, levels.layout_for(level))
         self.pacman = PacMan(self.map.pacman_start_pos, CELL_SIZE)
+        self.pacman.turn_buffer = self.turn_buffer
         
         # Create ghosts with different colors and behaviors
         self.ghosts = []
-        ghost_colors = [RED, (255, 192, 203), (0, 255, 255), (255, 165, 0)]  # Red, Pink, Cyan, Orange
-        ghost_personalities = ["chase", "ambush", "random", "patrol"]
-        
-        for i, (color, personality) in enumerate(zip(ghost_colors, ghost_personalities)):
+        for i, (color, personality) in enumerate(zip(GHOST_COLORS, self.ghost_brains)):
             start_pos = self.map.ghost_start_pos[min(i, len(self.map.ghost_start_pos)-1)]
-            self.ghosts.append(Ghost(start_pos, CELL_SIZE, color, personality))
+            ghost = Ghost(start_pos, CELL_SIZE, color, personality, self.rng)
+            ghost.speed = levels.ghost_speed(level)
+            ghost.monitor = self.brains
+            self.ghosts.append(ghost)
         
         self.power_mode = False
         self.power_timer = 0
+        self.power_duration = levels.power_duration(level, FPS)
         self.total_pellets = self.map.count_pellets()
         self.collected_pellets = 0
     
@@ -78,7 +149,16 @@ class Game:
             if event.type == QUIT:
                 self.running = False
             
+            if event.type == VIDEORESIZE and self.viewport is not None:
+                self.viewport.resize()
+            
+            if event.type == KEYUP and event.key == K_BACKSPACE:
+                self.rewinding = False
+            
             if event.type == KEYDOWN:
+                if event.key == K_BACKSPACE:
+                    self.rewinding = True
+                
                 if event.key == K_ESCAPE:
                     if self.state == "PLAYING":
                         self.state = "PAUSED"
@@ -87,28 +167,72 @@ class Game:
                 
                 if event.key == K_RETURN:
                     if self.state == "MENU":
+                        # Build the world now so it picks up any sprites
+                        # that finished loading while the menu was shown
+                        self.reset_game()
                         self.state = "PLAYING"
                     elif self.state == "GAME_OVER" or self.state == "WIN":
                         self.reset_game()
                         self.state = "PLAYING"
                 
                 # Handle Pac-Man movement
-                if self.state == "PLAYING":
-                    if event.key == K_UP:
-                        self.pacman.change_direction("UP")
-                    elif event.key == K_DOWN:
-                        self.pacman.change_direction("DOWN")
-                    elif event.key == K_LEFT:
-                        self.pacman.change_direction("LEFT")
-                    elif event.key == K_RIGHT:
-                        self.pacman.change_direction("RIGHT")
-    
-    def update(self):
-        """Update game state"""
+                if self.state == "PLAYING" and event.key in KEY_DIRECTIONS:
+                    if self.inputs is not None:
+                        self.inputs.push(KEY_DIRECTIONS[event.key])
+                    else:
+                        self.pacman.change_direction(KEY_DIRECTIONS[event.key])
+    
+    def update(self, steps=1):
+        """Advance the game by steps ticks
+        
+        Several steps at once are fast-forwarded (see fastforward.py) with
+        exactly the same result as updating tick by tick, except that an
+        autopilot is only consulted when Pac-Man reaches a cell center or
+        is blocked (which is all the built-in ones act on).
+        """
+        if steps > 1 and self.rewind is None and not self.rewinding:
+            fastforward.run(self, steps)
+            return
+        for _ in range(steps):
+            self.tick()
+    
+    def tick(self):
+        """Update game state by one tick"""
         if self.state != "PLAYING":
             return
         
+        # Hold BACKSPACE to rewind
+        if self.rewinding and self.rewind is not None:
+            self.rewind.step_back(self)
+            return
+        
+        pacman_start = self.update_pacman()
+        self.update_power_timer()
+        
+        # Update ghosts
+        for ghost in self.ghosts:
+            ghost_start = (ghost.x, ghost.y)
+            ghost.update(self.map, self.pacman, self.power_mode, self.get_ghosts)
+            if self.ghost_touches(ghost, pacman_start, ghost_start) and self.ghost_collision(ghost):
+                break  # One life per tick, however many ghosts touched him
+        
+        self.check_level_cleared()
+        
+        if self.rewind is not None:
+            self.rewind.record(self)
+    
+    def get_ghosts(self):
+        """The ghosts as they are right now (for ghost brains)"""
+        return self.ghosts
+    
+    def update_pacman(self):
+        """Steer and move Pac-Man and eat what he reaches; returns where he started"""
+        # Let the autopilot steer
+        if self.autopilot is not None:
+            self.autopilot.update(self)
+        
         # Update Pac-Man
+        start = (self.pacman.x, self.pacman.y)
         self.pacman.update(self.map)
         
         # Check for pellet collection
@@ -116,100 +240,241 @@ class Game:
         if pellet_type == 1:  # Regular pellet
             self.score += 10
             self.collected_pellets += 1
-            if self.has_sounds:
-                self.chomp_sound.play()
+            self.play_sound("chomp")
         elif pellet_type == 2:  # Power pellet
             self.score += 50
             self.collected_pellets += 1
             self.power_mode = True
-            self.power_timer = FPS * 10  # 10 seconds of power mode
+            self.power_timer = self.power_duration  # Shorter on later levels
             
             # Make all ghosts frightened
             for ghost in self.ghosts:
-                ghost.frightened = True
+                ghost.frighten(self.power_timer)
             
-            if self.has_sounds:
-                self.power_pellet_sound.play()
-        
-        # Update power mode timer
+            self.play_sound("power_pellet")
+        return start
+    
+    def update_power_timer(self):
+        """Count down power mode; returns True on the tick it runs out"""
         if self.power_mode:
             self.power_timer -= 1
             if self.power_timer <= 0:
                 self.power_mode = False
                 for ghost in self.ghosts:
                     ghost.frightened = False
+                return True
+        return False
+    
+    def ghost_touches(self, ghost, pacman_start, ghost_start):
+        """Check if Pac-Man and a ghost touched during the last tick
         
-        # Update ghosts
-        for ghost in self.ghosts:
-            ghost.update(self.map, self.pacman, self.power_mode)
-            
-            # Check for ghost collision
-            if self.pacman.rect.colliderect(ghost.rect):
-                if self.power_mode and ghost.frightened:
-                    # Eat the ghost
-                    ghost.reset(self.map.ghost_start_pos[0])
-                    ghost.frightened = False
-                    self.score += 200
-                    if self.has_sounds:
-                        self.eat_ghost_sound.play()
-                else:
-                    # Lose a life
-                    self.lives -= 1
-                    if self.has_sounds:
-                        self.death_sound.play()
-                    
-                    if self.lives <= 0:
-                        self.state = "GAME_OVER"
-                    else:
-                        # Reset positions
-                        self.pacman.reset(self.map.pacman_start_pos)
-                        for i, ghost in enumerate(self.ghosts):
-                            pos = self.map.ghost_start_pos[min(i, len(self.map.ghost_start_pos)-1)]
-                            ghost.reset(pos)
+        Besides overlapping now, their paths over the tick are swept so
+        the two cannot pass through each other, however far they moved.
+        """
+        pacman = self.pacman
+        if pacman.rect.colliderect(ghost.rect):
+            return True
+        reach = (pacman.rect.width + ghost.rect.width) / 2
+        pacman_velocity = (pacman.x - pacman_start[0], pacman.y - pacman_start[1])
+        ghost_velocity = (ghost.x - ghost_start[0], ghost.y - ghost_start[1])
+        return first_contact(pacman_start, pacman_velocity, ghost_start, ghost_velocity, reach, 1) is not None
+    
+    def ghost_collision(self, ghost):
+        """Eat a frightened ghost or lose a life; returns True if a life was lost"""
+        if self.power_mode and ghost.frightened:
+            # Eat the ghost
+            ghost.reset(self.map.ghost_start_pos[0])
+            ghost.frightened = False
+            self.score += 200
+            self.play_sound("eat_ghost")
+            return False
+        
+        # Lose a life
+        self.lives -= 1
+        self.play_sound("death")
         
-        # Check win condition
+        if self.lives <= 0:
+            self.state = "GAME_OVER"
+        else:
+            # Reset positions
+            self.pacman.reset(self.map.pacman_start_pos)
+            for i, other in enumerate(self.ghosts):
+                pos = self.map.ghost_start_pos[min(i, len(self.map.ghost_start_pos)-1)]
+                other.reset(pos)
+        return True
+    
+    def check_level_cleared(self):
+        """Move on to the next maze once every pellet is eaten, or win after the last one"""
         if self.collected_pellets >= self.total_pellets:
-            self.state = "WIN"
+            if self.max_level is not None and self.level >= self.max_level:
+                self.state = "WIN"
+            else:
+                self.start_level(self.level + 1)
     
     def draw(self):
         """Draw the game elements"""
-        screen.fill(BLACK)
+        self.screen.fill(BLACK)
+        
+        effects = self.pacer is None or self.pacer.effects
         
         if self.state == "MENU":
             self.ui.draw_menu()
         elif self.state == "PLAYING" or self.state == "PAUSED":
             # Draw map
-            self.map.draw(screen)
+            self.map.draw(self.screen, effects)
             
             # Draw Pac-Man
-            self.pacman.draw(screen)
+            self.pacman.draw(self.screen)
             
             # Draw ghosts
             for ghost in self.ghosts:
-                ghost.draw(screen)
+                ghost.draw(self.screen)
             
             # Draw UI elements
             self.ui.draw_game_ui(self.score, self.lives, self.level)
+            if self.pacer is not None:
+                self.ui.draw_pacing(self.pacer.status())
             
             if self.state == "PAUSED":
                 self.ui.draw_pause_screen()
         elif self.state == "GAME_OVER":
             self.ui.draw_game_over(self.score)
         elif self.state == "WIN":
-            self.ui.draw_win_screen(self.score)
+            self.ui.draw_win_screen(self.score, effects)
+    
+    def render(self):
+        """Draw, capture and show a frame"""
+        self.draw()
+        if self.recorder is not None:
+            self.recorder.capture(self.screen)
+        if self.viewport is not None:
+            self.viewport.present()
+        pygame.display.flip()
+        if self.inputs is not None:
+            self.inputs.displayed()
+    
+    def frame(self):
+        """Run one pass of the main loop"""
+        self.handle_events()
+        if self.pacer is None:
+            if self.inputs is not None:
+                self.inputs.apply_due(self.pacman)
+            self.update()
+            self.render()
+            self.clock.tick(FPS)
+            return
+        
+        # Keep updates on schedule and draw only if there is time left
+        self.run_updates(self.pacer.updates_due(), self.pacer.due_from, self.pacer.frame_time)
+        if self.pacer.should_draw(self.inputs is not None and self.inputs.waiting_for_display()):
+            start = time.perf_counter()
+            self.render()
+            self.pacer.frame_drawn(time.perf_counter() - start)
+        # Keep reading input while waiting, so it is stamped close to arrival
+        self.pacer.wait(self.handle_events if self.inputs is not None else None)
+    
+    def run_updates(self, count, first_time, interval):
+        """Run count updates due from first_time on, applying each input at the tick it arrived for"""
+        done = 0
+        while done < count:
+            batch = count - done
+            if self.inputs is not None:
+                self.inputs.apply_due(self.pacman, first_time + done * interval)
+                arrival = self.inputs.next_arrival()
+                if arrival is not None:
+                    # Stop short of the tick the next input is for
+                    batch = min(batch, max(1, math.ceil((arrival - first_time) / interval) - done))
+            self.update(batch)
+            done += batch
     
     def run(self):
         """Main game loop"""
         while self.running:
-            self.handle_events()
-            self.update()
-            self.draw()
-            pygame.display.flip()
-            clock.tick(FPS)
+            self.frame()
+        
+        if self.autopilot is not None:
+            print(self.autopilot.report())
+        if self.pacer is not None:
+            print(self.pacer.report())
+        if self.inputs is not None:
+            print(self.inputs.report())
+        print(self.brains.report())
+        if self.recorder is not None:
+            try:
+                self.recorder.close()
+            finally:
+                print(self.recorder.report())
         
         pygame.quit()
         sys.exit()
 
 if __name__ == "__main__":
-    game = Game()
+    import importlib
+    parser = argparse.ArgumentParser(description="Pac-Man")
+    parser.add_argument("--autopilot", nargs="?", const="search", choices=["search", "rollout"],
+                        help="let Pac-Man play himself (search: A*-style planner, rollout: Monte Carlo)")
+    parser.add_argument("--autopilot-budget", type=float, metavar="MS",
+                        help="planning time per tick (search, default 1) or per decision (rollout, default 8) in ms")
+    parser.add_argument("--levels", type=int, metavar="N", help="win after clearing N levels (default: endless)")
+    parser.add_argument("--rewind-seconds", type=float, default=10, metavar="SECONDS",
+                        help="how much play BACKSPACE can rewind (0 disables)")
+    parser.add_argument("--record", metavar="PATH",
+                        help="capture gameplay to a PNG directory (or a raw RGB file with --record-format raw)")
+    parser.add_argument("--record-format", choices=["png", "raw"], default="png")
+    parser.add_argument("--record-every", type=int, default=1, metavar="N", help="capture every Nth frame")
+    parser.add_argument("--turn-buffer", type=int, default=TURN_BUFFER, metavar="TICKS",
+                        help=f"ticks a turn key waits for a corner (default {TURN_BUFFER}, 0 turns wherever possible)")
+    parser.add_argument("--ghost-brains", metavar="NAMES",
+                        help="comma-separated brain for each ghost (default chase,ambush,random,patrol)")
+    parser.add_argument("--brain-plugin", action="append", default=[], metavar="MODULE",
+                        help="import a module that registers more ghost brains (repeatable)")
+    parser.add_argument("--adaptive-pacing", action="store_true",
+                        help="skip drawing and reduce effects when rendering falls behind, instead of slowing the game")
+    parser.add_argument("--window", type=window_size, metavar="WIDTHxHEIGHT",
+                        help=f"open a resizable window of this size, scaling the {SCREEN_WIDTH}x{SCREEN_HEIGHT} game to fit")
+    parser.add_argument("--smooth-scaling", action="store_true",
+                        help="scale with filtering in a resizable window (nicer, but slower at large sizes)")
+    args = parser.parse_args()
+    
+    # Check the ghost brains before opening the window
+    for module in args.brain_plugin:
+        try:
+            importlib.import_module(module)
+        except ImportError as error:
+            parser.error(f"--brain-plugin {module}: {error}")
+    ghost_brains = args.ghost_brains.split(",") if args.ghost_brains else None
+    if ghost_brains is not None:
+        unknown = [name for name in ghost_brains if name not in BRAINS]
+        if unknown:
+            parser.error(f"unknown ghost brain(s) {', '.join(unknown)} (known: {', '.join(sorted(BRAINS))})")
+        if len(ghost_brains) != len(GHOST_COLORS):
+            parser.error(f"--ghost-brains needs {len(GHOST_COLORS)} names, one per ghost, got {len(ghost_brains)}")
+    
+    if args.window or args.smooth_scaling:
+        window = init_display(args.window or (SCREEN_WIDTH, SCREEN_HEIGHT), resizable=True)
+        viewport = Viewport(window, (SCREEN_WIDTH, SCREEN_HEIGHT), args.smooth_scaling)
+        screen = viewport.target
+    else:
+        viewport = None
+        screen = init_display()
+    assets = AssetLoader()
+    assets.start()
+    game = Game(screen, assets)
+    game.viewport = viewport
+    game.max_level = args.levels
+    if ghost_brains is not None:
+        game.ghost_brains = ghost_brains
+        game.reset_game()
+    game.inputs = InputQueue()
+    game.turn_buffer = args.turn_buffer or None
+    if args.autopilot == "search":
+        game.autopilot = Autopilot(args.autopilot_budget or 1.0)
+    elif args.autopilot == "rollout":
+        game.autopilot = RolloutPlanner(deadline_ms=args.autopilot_budget or 8.0, plugins=args.brain_plugin)
+    if args.rewind_seconds > 0:
+        game.rewind = RewindBuffer(game, args.rewind_seconds, FPS)
+    if args.record:
+        game.recorder = FrameRecorder(args.record, args.record_every, args.record_format)
+    if args.adaptive_pacing:
+        game.pacer = FramePacer(FPS)
     game.run()
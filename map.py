@@ -1,5 +1,10 @@
 import pygame
 import random
+import threading
+import time
+import assets
+import levels
+import maze
 
 # Colors
 BLACK = (0, 0, 0)
@@ -8,79 +13,68 @@ WHITE = (255, 255, 255)
 YELLOW = (255, 255, 0)
 
 class Map:
-    def __init__(self, cell_size):
-        """Initialize the game map with walls, pellets, and starting positions"""
+    def __init__(self, cell_size, layout=None):
+        """Initialize the game map with walls, pellets, and starting positions
+        
+        layout defaults to the first level's maze (see levels.py). Raises
+        maze.MazeError if the layout cannot be played.
+        """
         self.cell_size = cell_size
-        self.width = 20  # Map width in cells
-        self.height = 15  # Map height in cells
         
-        # Create the map layout
+        # Copy the layout since eating pellets edits it
         # 0 = empty path, 1 = wall, 2 = pellet, 3 = power pellet, 4 = pacman start, 5 = ghost start
-        self.layout = [
-            [1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1],
-            [1, 2, 2, 2, 2, 2, 2, 2, 2, 1, 1, 2, 2, 2, 2, 2, 2, 2, 2, 1],
-            [1, 3, 1, 1, 2, 1, 1, 1, 2, 1, 1, 2, 1, 1, 1, 2, 1, 1, 3, 1],
-            [1, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 1],
-            [1, 2, 1, 1, 2, 1, 2, 1, 1, 1, 1, 1, 1, 2, 1, 2, 1, 1, 2, 1],
-            [1, 2, 2, 2, 2, 1, 2, 2, 2, 1, 1, 2, 2, 2, 1, 2, 2, 2, 2, 1],
-            [1, 1, 1, 1, 2, 1, 1, 1, 0, 1, 1, 0, 1, 1, 1, 2, 1, 1, 1, 1],
-            [0, 0, 0, 1, 2, 1, 0, 0, 0, 5, 5, 0, 0, 0, 1, 2, 1, 0, 0, 0],
-            [1, 1, 1, 1, 2, 1, 0, 1, 1, 5, 5, 1, 1, 0, 1, 2, 1, 1, 1, 1],
-            [0, 0, 0, 0, 2, 0, 0, 1, 0, 0, 0, 0, 1, 0, 0, 2, 0, 0, 0, 0],
-            [1, 1, 1, 1, 2, 1, 0, 1, 1, 1, 1, 1, 1, 0, 1, 2, 1, 1, 1, 1],
-            [0, 0, 0, 1, 2, 1, 0, 0, 0, 4, 0, 0, 0, 0, 1, 2, 1, 0, 0, 0],
-            [1, 1, 1, 1, 2, 1, 0, 1, 1, 1, 1, 1, 1, 0, 1, 2, 1, 1, 1, 1],
-            [1, 2, 2, 2, 2, 2, 2, 2, 2, 1, 1, 2, 2, 2, 2, 2, 2, 2, 2, 1],
-            [1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1]
-        ]
-        
-        # Find starting positions
-        self.pacman_start_pos = self.find_position(4)
-        self.ghost_start_pos = self.find_all_positions(5)
+        self.layout = [list(row) for row in (layout or levels.LAYOUTS[0])]
+        self.height = len(self.layout)  # Map height in cells
+        self.width = len(self.layout[0])  # Map width in cells
+        
+        # Checked and derived once per layout (see maze.py)
+        self.compiled = maze.compile_maze(self.layout)
+        
+        # Built by prepare() (on a background thread when preloading)
+        self.distances = None
+        self.wall_layer = None
+        
+        # Walls plus the small pellets still on the board, redrawn only after
+        # pellets change (board_bits is the pellet_bits it was drawn for)
+        self.board_layer = None
+        self.board_bits = None
+        
+        # Starting positions (cell centers)
+        self.pacman_start_pos = self.cell_center(self.compiled.pacman_start)
+        self.ghost_start_pos = [self.cell_center(cell) for cell in self.compiled.ghost_starts]
         
         # Create wall rects for collision detection
-        self.walls = []
+        self.walls = [pygame.Rect(x * cell_size, y * cell_size, cell_size, cell_size)
+                      for x, y in self.compiled.walls]
         self.pellets = []
         self.power_pellets = []
         
-        for y in range(self.height):
-            for x in range(self.width):
-                cell_value = self.layout[y][x]
-                rect = pygame.Rect(x * cell_size, y * cell_size, cell_size, cell_size)
-                
-                if cell_value == 1:  # Wall
-                    self.walls.append(rect)
-                elif cell_value == 2:  # Pellet
-                    self.pellets.append(rect)
-                elif cell_value == 3:  # Power Pellet
-                    self.power_pellets.append(rect)
+        # Pellets still on the board as a bitset (bit y * width + x), plus the
+        # original pellet of each cell so they can be restored from snapshots
+        self.pellet_bits = 0
+        self.pellet_cells = {}
+        
+        for (x, y), cell_value in self.compiled.pellets:
+            rect = pygame.Rect(x * cell_size, y * cell_size, cell_size, cell_size)
+            if cell_value == 2:  # Pellet
+                self.pellets.append(rect)
+            else:  # Power Pellet
+                self.power_pellets.append(rect)
+            self.pellet_bits |= 1 << (y * self.width + x)
+            self.pellet_cells[(x, y)] = (cell_value, rect)
         
         # Try to load wall texture, otherwise use a simple blue rectangle
         try:
-            self.wall_texture = pygame.image.load('assets/images/wall.png')
+            self.wall_texture = assets.load_image('assets/images/wall.png')
             self.wall_texture = pygame.transform.scale(self.wall_texture, (cell_size, cell_size))
             self.has_wall_texture = True
         except:
             self.has_wall_texture = False
     
-    def find_position(self, value):
-        """Find the first position of a specific value in the layout"""
-        for y in range(self.height):
-            for x in range(self.width):
-                if self.layout[y][x] == value:
-                    return (x * self.cell_size + self.cell_size // 2, 
-                            y * self.cell_size + self.cell_size // 2)
-        return (0, 0)  # Default if not found
-    
-    def find_all_positions(self, value):
-        """Find all positions of a specific value in the layout"""
-        positions = []
-        for y in range(self.height):
-            for x in range(self.width):
-                if self.layout[y][x] == value:
-                    positions.append((x * self.cell_size + self.cell_size // 2, 
-                                     y * self.cell_size + self.cell_size // 2))
-        return positions
+    def cell_center(self, cell):
+        """Pixel position of a grid cell's center"""
+        x, y = cell
+        return (x * self.cell_size + self.cell_size // 2, y * self.cell_size + self.cell_size // 2)
     
     def count_pellets(self):
         """Count the total number of pellets and power pellets"""
@@ -97,6 +91,7 @@ class Map:
             
             if cell_value == 2:  # Regular pellet
                 self.layout[grid_y][grid_x] = 0
+                self.pellet_bits &= ~(1 << (grid_y * self.width + grid_x))
                 # Remove the pellet from the list
                 pellet_rect = pygame.Rect(grid_x * self.cell_size, grid_y * self.cell_size, 
                                          self.cell_size, self.cell_size)
@@ -105,6 +100,7 @@ class Map:
                 return 1
             elif cell_value == 3:  # Power pellet
                 self.layout[grid_y][grid_x] = 0
+                self.pellet_bits &= ~(1 << (grid_y * self.width + grid_x))
                 # Remove the power pellet from the list
                 power_pellet_rect = pygame.Rect(grid_x * self.cell_size, grid_y * self.cell_size, 
                                               self.cell_size, self.cell_size)
@@ -114,6 +110,42 @@ class Map:
         
         return 0  # No pellet collision
     
+    def set_pellet_bits(self, bits):
+        """Put back exactly the pellets in a bitset from pellet_bits"""
+        changed = bits ^ self.pellet_bits
+        if not changed:
+            return
+        
+        # Big jumps (e.g. back to the start of a level): rebuild everything
+        if bin(changed).count("1") > 16:
+            self.pellets = []
+            self.power_pellets = []
+            for (x, y), (cell_value, rect) in self.pellet_cells.items():
+                if bits >> (y * self.width + x) & 1:
+                    self.layout[y][x] = cell_value
+                    (self.pellets if cell_value == 2 else self.power_pellets).append(rect)
+                else:
+                    self.layout[y][x] = 0
+            self.pellet_bits = bits
+            return
+        
+        # Otherwise visit only the cells whose pellet appeared or disappeared
+        while changed:
+            lowest = changed & -changed
+            changed ^= lowest
+            y, x = divmod(lowest.bit_length() - 1, self.width)
+            cell_value, rect = self.pellet_cells[(x, y)]
+            rects = self.pellets if cell_value == 2 else self.power_pellets
+            
+            if bits & lowest:
+                self.layout[y][x] = cell_value
+                rects.append(rect)
+            else:
+                self.layout[y][x] = 0
+                rects.remove(rect)
+        
+        self.pellet_bits = bits
+    
     def is_wall(self, position):
         """Check if a position contains a wall"""
         x, y = position
@@ -131,6 +163,11 @@ class Map:
         grid_x = int(x // self.cell_size)
         grid_y = int(y // self.cell_size)
         
+        # Open cells have their exits worked out already
+        exits = self.compiled.exits.get((grid_x, grid_y))
+        if exits is not None:
+            return list(exits)
+        
         valid_directions = []
         directions = [("UP", (0, -1)), ("DOWN", (0, 1)), ("LEFT", (-1, 0)), ("RIGHT", (1, 0))]
         
@@ -142,16 +179,42 @@ class Map:
         
         return valid_directions
     
-    def draw(self, surface):
-        """Draw the map with walls and pellets"""
-        # Draw walls
+    def prepare(self):
+        """Build the distance tables and the cached wall and pellet layers ahead of time"""
+        self.build_distances()
+        self.build_board_layer()
+    
+    def build_distances(self):
+        """Shortest path length (in cells) between every pair of open cells"""
+        # Compiled with the maze and shared by every map of this layout
+        self.distances = self.compiled.distance_table()
+    
+    def distance(self, start, end):
+        """Cells between two grid cells (None if unreachable)"""
+        if self.distances is None:
+            self.build_distances()
+        return self.distances.get(start, {}).get(end)
+    
+    def build_wall_layer(self):
+        """Render the walls once into a surface the size of the maze"""
+        layer = pygame.Surface((self.width * self.cell_size, self.height * self.cell_size))
+        layer.fill(BLACK)
         for wall in self.walls:
             if self.has_wall_texture:
-                surface.blit(self.wall_texture, wall)
+                layer.blit(self.wall_texture, wall)
             else:
-                pygame.draw.rect(surface, BLUE, wall)
+                pygame.draw.rect(layer, BLUE, wall)
+        self.wall_layer = layer
+    
+    def build_board_layer(self):
+        """Render the walls and the remaining small pellets into one surface"""
+        if self.wall_layer is None:
+            self.build_wall_layer()
+        if self.board_layer is None:
+            self.board_layer = self.wall_layer.copy()
+        else:
+            self.board_layer.blit(self.wall_layer, (0, 0))
         
-        # Draw pellets
         for pellet in self.pellets:
             pellet_rect = pygame.Rect(
                 pellet.x + self.cell_size // 3,
@@ -159,12 +222,23 @@ class Map:
                 self.cell_size // 3,
                 self.cell_size // 3
             )
-            pygame.draw.ellipse(surface, WHITE, pellet_rect)
+            pygame.draw.ellipse(self.board_layer, WHITE, pellet_rect)
+        self.board_bits = self.pellet_bits
+    
+    def draw(self, surface, effects=True):
+        """Draw the map with walls and pellets (effects=False stops the power pellets pulsing)"""
+        # Draw walls and pellets (pre-rendered until a pellet is eaten or restored)
+        if self.board_bits != self.pellet_bits:
+            self.build_board_layer()
+        surface.blit(self.board_layer, (0, 0))
         
         # Draw power pellets (larger and pulsating)
         for power_pellet in self.power_pellets:
             # Create a pulsating effect
-            size_mod = abs(pygame.time.get_ticks() % 1000 - 500) / 500.0 * 0.2 + 0.6
+            if effects:
+                size_mod = abs(pygame.time.get_ticks() % 1000 - 500) / 500.0 * 0.2 + 0.6
+            else:
+                size_mod = 0.7
             power_size = int(self.cell_size * size_mod)
             power_rect = pygame.Rect(
                 power_pellet.x + (self.cell_size - power_size) // 2,
@@ -173,3 +247,66 @@ class Map:
                 power_size
             )
             pygame.draw.ellipse(surface, YELLOW, power_rect)
+
+class MapPreloader:
+    def __init__(self, cell_size):
+        """Build the next level's map on a background thread while the current one plays"""
+        self.cell_size = cell_size
+        self.level = None  # Level being built (or ready)
+        self.map = None
+        self.error = None  # Exception the background build failed with
+        self.thread = None
+    
+    def start(self, level):
+        """Begin building a level's map in the background"""
+        if self.level == level:
+            return  # Already on it
+        self.wait()
+        self.level = level
+        self.map = None
+        self.error = None
+        self.thread = threading.Thread(target=self._build, args=(level,), name="map-preloader", daemon=True)
+        self.thread.start()
+    
+    def _build(self, level):
+        """Preloader thread: construct the map and everything it caches"""
+        # Hand the GIL back between steps so the game loop is never held up
+        try:
+            time.sleep(0)
+            game_map = Map(self.cell_size, levels.layout_for(level))
+            time.sleep(0)
+            game_map.build_distances()
+            time.sleep(0)
+            game_map.build_board_layer()
+            self.map = game_map
+        except Exception as error:
+            self.error = error  # Raised by take()
+    
+    def wait(self):
+        """Block until the background build (if any) has finished"""
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+    
+    def take(self, level):
+        """Get a fresh map for a level, preloaded if possible
+        
+        Waits for a build of that level still in progress, or builds it
+        right away if a different level was preloaded. Raises whatever
+        the background build of that level failed with.
+        """
+        game_map = None
+        if self.level == level:
+            self.wait()
+            game_map = self.map
+            error = self.error
+            self.level = None
+            self.map = None
+            self.error = None
+            if error is not None:
+                raise error
+        
+        if game_map is None:
+            game_map = Map(self.cell_size, levels.layout_for(level))
+            game_map.prepare()
+        return game_map
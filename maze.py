@@ -0,0 +1,218 @@
+"""Compile maze layouts once and cache what is derived from them.
+
+compile_maze(layout) checks a layout and works out its start cells,
+pellets, exits, reachability, dead ends and the shortest path between
+every pair of open cells. Results are kept in memory and saved under
+.maze_cache/ keyed by a hash of the layout, so building the same maze
+again (every reset and level change) costs next to nothing, even in a
+new process. A broken maze raises MazeError when it is loaded.
+
+    python maze.py  # check every level layout
+"""
+import hashlib
+import json
+import os
+from collections import deque
+
+FORMAT_VERSION = 1  # Bump when the cached data changes shape
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".maze_cache")
+
+# Layout values (see levels.py)
+WALL = 1
+PELLET = 2
+POWER_PELLET = 3
+PACMAN_START = 4
+GHOST_START = 5
+CELL_VALUES = (0, WALL, PELLET, POWER_PELLET, PACMAN_START, GHOST_START)
+
+# Exit mask bits, in Map.get_valid_directions order
+DIRECTION_BITS = (("UP", (0, -1), 1), ("DOWN", (0, 1), 2), ("LEFT", (-1, 0), 4), ("RIGHT", (1, 0), 8))
+
+class MazeError(ValueError):
+    """A maze layout that cannot be played"""
+
+class CompiledMaze:
+    def __init__(self, key, data):
+        """Derived maze data, built from a compile result or a cache file"""
+        self.key = key
+        self.width = data["width"]
+        self.height = data["height"]
+        self.pacman_start = tuple(data["pacman_start"])
+        self.ghost_starts = [tuple(cell) for cell in data["ghost_starts"]]
+        self.walls = tuple(tuple(cell) for cell in data["walls"])
+
+        # Pellets in layout order, and each pellet cell's position in that order
+        self.pellets = tuple(((x, y), value) for x, y, value in data["pellets"])
+        self.pellet_index = {cell: index for index, (cell, _) in enumerate(self.pellets)}
+
+        # Exits of every open cell, as a bitmask and as direction names
+        self.open_cells = tuple(tuple(cell) for cell in data["open_cells"])
+        self.exit_masks = dict(zip(self.open_cells, data["exit_masks"]))
+        self.exits = {
+            cell: tuple(name for name, _, bit in DIRECTION_BITS if mask & bit)
+            for cell, mask in self.exit_masks.items()
+        }
+        self.dead_ends = frozenset(tuple(cell) for cell in data["dead_ends"])
+        self.reachable = frozenset(tuple(cell) for cell in data["reachable"])  # From Pac-Man's start
+
+        self._matrix = data["distances"]
+        self._distances = None
+
+    def distance_table(self):
+        """Shortest path length between every pair of connected open cells, as {start: {end: steps}}"""
+        if self._distances is None:
+            cells = self.open_cells
+            self._distances = {
+                start: {end: steps for end, steps in zip(cells, row) if steps >= 0}
+                for start, row in zip(cells, self._matrix)
+            }
+        return self._distances
+
+# Compiled mazes by layout, for this process
+_compiled = {}
+
+def clear_cache(disk=False, cache_dir=CACHE_DIR):
+    """Forget compiled mazes in memory (and the cache files too if disk is set)"""
+    _compiled.clear()
+    if disk and cache_dir is not None and os.path.isdir(cache_dir):
+        for name in os.listdir(cache_dir):
+            if name.endswith(".json"):
+                os.remove(os.path.join(cache_dir, name))
+
+def layout_key(layout):
+    """Hash identifying a layout (and the cache format)"""
+    text = json.dumps({"version": FORMAT_VERSION, "layout": layout}, separators=(",", ":"))
+    return hashlib.sha256(text.encode()).hexdigest()
+
+def compile_maze(layout, cache_dir=CACHE_DIR):
+    """Compiled data for a layout, from memory, the disk cache or compiled now"""
+    frozen = tuple(tuple(row) for row in layout)
+    compiled = _compiled.get(frozen)
+    if compiled is not None:
+        return compiled
+
+    key = layout_key([list(row) for row in frozen])
+    data = _load(key, cache_dir)
+    if data is not None:
+        try:
+            compiled = CompiledMaze(key, data)
+        except (KeyError, TypeError, ValueError):
+            compiled = None  # Damaged cache file: compile again
+    if compiled is None:
+        data = _derive(frozen)
+        _save(key, data, cache_dir)
+        compiled = CompiledMaze(key, data)
+    _compiled[frozen] = compiled
+    return compiled
+
+def _load(key, cache_dir):
+    """Read cached data for a layout hash (None if missing or unreadable)"""
+    if cache_dir is None:
+        return None
+    try:
+        with open(os.path.join(cache_dir, key + ".json")) as cache_file:
+            return json.load(cache_file)
+    except (OSError, ValueError):
+        return None
+
+def _save(key, data, cache_dir):
+    """Write cached data for a layout hash (skipped if the directory is not writable)"""
+    if cache_dir is None:
+        return
+    path = os.path.join(cache_dir, key + ".json")
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # Write then rename, so a concurrent reader never sees half a file
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w") as cache_file:
+            json.dump(data, cache_file, separators=(",", ":"))
+        os.replace(temp_path, path)
+    except OSError:
+        pass
+
+def _derive(layout):
+    """Check a layout and work out everything CompiledMaze holds"""
+    if not layout or not layout[0]:
+        raise MazeError("maze is empty")
+    height, width = len(layout), len(layout[0])
+    for y, row in enumerate(layout):
+        if len(row) != width:
+            raise MazeError(f"row {y} has {len(row)} cells, expected {width}")
+        for x, value in enumerate(row):
+            if value not in CELL_VALUES:
+                raise MazeError(f"unknown cell value {value!r} at ({x}, {y})")
+
+    cells = [(x, y) for y in range(height) for x in range(width)]
+    walls = [cell for cell in cells if layout[cell[1]][cell[0]] == WALL]
+    open_cells = [cell for cell in cells if layout[cell[1]][cell[0]] != WALL]
+    pacman_starts = [cell for cell in cells if layout[cell[1]][cell[0]] == PACMAN_START]
+    ghost_starts = [cell for cell in cells if layout[cell[1]][cell[0]] == GHOST_START]
+    pellets = [[x, y, layout[y][x]] for x, y in cells if layout[y][x] in (PELLET, POWER_PELLET)]
+    if len(pacman_starts) != 1:
+        raise MazeError(f"maze needs exactly one Pac-Man start, found {len(pacman_starts)}")
+    if not ghost_starts:
+        raise MazeError("maze has no ghost start")
+    if not pellets:
+        raise MazeError("maze has no pellets")
+
+    # Exits out of every open cell
+    open_set = set(open_cells)
+    exit_masks = []
+    neighbours = {}
+    for x, y in open_cells:
+        mask = 0
+        neighbours[(x, y)] = []
+        for _, (dx, dy), bit in DIRECTION_BITS:
+            if (x + dx, y + dy) in open_set:
+                mask |= bit
+                neighbours[(x, y)].append((x + dx, y + dy))
+        exit_masks.append(mask)
+    dead_ends = [cell for cell, mask in zip(open_cells, exit_masks) if bin(mask).count("1") == 1]
+
+    # Shortest paths from every open cell (breadth-first search)
+    index = {cell: i for i, cell in enumerate(open_cells)}
+    distances = []
+    for start in open_cells:
+        row = [-1] * len(open_cells)
+        row[index[start]] = 0
+        queue = deque([start])
+        while queue:
+            cell = queue.popleft()
+            steps = row[index[cell]] + 1
+            for neighbour in neighbours[cell]:
+                if row[index[neighbour]] < 0:
+                    row[index[neighbour]] = steps
+                    queue.append(neighbour)
+        distances.append(row)
+
+    # Every pellet and ghost start has to be reachable from Pac-Man's start
+    # (walled-off empty cells are only decoration)
+    from_start = distances[index[pacman_starts[0]]]
+    reachable = [cell for cell in open_cells if from_start[index[cell]] >= 0]
+    needed = [(x, y) for x, y, _ in pellets] + ghost_starts
+    unreachable = [cell for cell in needed if from_start[index[cell]] < 0]
+    if unreachable:
+        raise MazeError(f"{len(unreachable)} pellets or ghost starts cannot be reached from Pac-Man's start, "
+                        f"e.g. {unreachable[:5]}")
+
+    return {
+        "width": width,
+        "height": height,
+        "pacman_start": pacman_starts[0],
+        "ghost_starts": ghost_starts,
+        "walls": walls,
+        "pellets": pellets,
+        "open_cells": open_cells,
+        "exit_masks": exit_masks,
+        "dead_ends": dead_ends,
+        "reachable": reachable,
+        "distances": distances,
+    }
+
+if __name__ == "__main__":
+    import levels
+    for number, layout in enumerate(levels.LAYOUTS, 1):
+        compiled = compile_maze(layout)
+        print(f"level {number}: {len(compiled.reachable)} of {len(compiled.open_cells)} open cells reachable, "
+              f"{len(compiled.pellets)} pellets, "
+              f"{len(compiled.dead_ends)} dead ends, {len(compiled.ghost_starts)} ghost starts ({compiled.key[:12]})")
@@ -0,0 +1,437 @@
+"""Watch many headless games at once as a mosaic of thumbnails.
+
+The games run in worker processes as fast as they can and publish a
+snapshot of each game (see snapshot.py) into shared memory about 60 times
+a second. The monitor copies those snapshots without taking any lock, so
+watching never holds a game up. Thumbnails are drawn from a small maze
+layer cached per level plus dots for Pac-Man and the ghosts, and only a
+share of them is redrawn each frame, so every tile is refreshed about
+TILE_FPS times a second. Click a tile to watch that game in full detail;
+click again or press ESC to go back.
+
+    python monitor.py --games 16 --autopilot
+"""
+import argparse
+import math
+import multiprocessing
+import os
+import random
+import signal
+import struct
+import time
+from multiprocessing import shared_memory
+
+import pygame
+from pygame.locals import *
+
+from main import Game, SCREEN_WIDTH, SCREEN_HEIGHT, GHOST_COLORS
+from autopilot import Autopilot
+from snapshot import StateCodec
+from viewport import Viewport
+
+# Monitor
+MONITOR_FPS = 30  # Monitor frames per second
+TILE_FPS = 5  # Times per second each thumbnail is redrawn
+WINDOW_SIZE = (1280, 720)
+LABEL_HEIGHT = 14  # Pixels under each thumbnail for its counters
+TILE_GAP = 4
+MONITOR_NICENESS = 5  # Lower priority for the monitor than the games it watches
+
+# Workers
+PUBLISH_INTERVAL = 1 / 60  # Seconds between snapshots of a worker's games
+STEER_EVERY = 16  # Ticks between random turns in games without an autopilot
+
+# Each game's shared memory slot: a header then a snapshot. The sequence
+# number is odd while the worker is writing the slot.
+HEADER = struct.Struct("<IQI")  # sequence, ticks played, games finished
+SEQUENCE = struct.Struct("<I")
+
+# Colors
+BLACK = (0, 0, 0)
+BLUE = (0, 0, 255)
+WHITE = (255, 255, 255)
+YELLOW = (255, 255, 0)
+RED = (255, 0, 0)
+FRIGHTENED = (33, 33, 255)
+
+def _play(memory_name, game_ids, slot_size, autopilot, stop):
+    """Worker process: play some of the games forever, publishing their state"""
+    # Ctrl+C is for the monitor, which stops the workers itself
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    memory = shared_memory.SharedMemory(name=memory_name)
+    try:
+        games = []
+        for game_id in game_ids:
+            game = Game()
+            game.rng.seed(game_id)
+            if autopilot:
+                game.autopilot = Autopilot()
+            game.reset_game()
+            game.state = "PLAYING"
+            games.append([game_id, game, random.Random(game_id), 0, 0, 0])  # id, game, rng, ticks, finished, sequence
+        codec = StateCodec.for_game(games[0][1])
+
+        next_publish = 0.0
+        while True:
+            for entry in games:
+                game_id, game, rng, ticks, finished, sequence = entry
+                if game.state != "PLAYING":
+                    game.reset_game()
+                    game.state = "PLAYING"
+                    entry[4] += 1
+                if game.autopilot is None:
+                    game.pacman.change_direction(rng.choice(["UP", "DOWN", "LEFT", "RIGHT"]))
+                game.update(STEER_EVERY)
+                entry[3] += STEER_EVERY
+
+            now = time.perf_counter()
+            if now < next_publish:
+                continue
+            next_publish = now + PUBLISH_INTERVAL
+            if stop.is_set():
+                break
+            for entry in games:
+                game_id, game, rng, ticks, finished, sequence = entry
+                offset = game_id * slot_size
+                HEADER.pack_into(memory.buf, offset, sequence + 1, ticks, finished)
+                codec.pack_into(memory.buf, offset + HEADER.size, game)
+                HEADER.pack_into(memory.buf, offset, sequence + 2, ticks, finished)
+                entry[5] = sequence + 2
+    finally:
+        memory.close()
+
+def read_slot(buffer, offset, size):
+    """Copy a game's slot, or None if its worker is writing it right now"""
+    before = SEQUENCE.unpack_from(buffer, offset)[0]
+    if before == 0 or before & 1:
+        return None  # Not published yet, or being written
+    data = bytes(buffer[offset:offset + size])
+    if SEQUENCE.unpack_from(buffer, offset)[0] != before:
+        return None
+    return data
+
+def mosaic_layout(count, size, maze_size):
+    """Columns, rows and maze cell size giving the biggest thumbnails for count games"""
+    width, height = size
+    maze_width, maze_height = maze_size
+    best = (1, count, 0)
+    for columns in range(1, count + 1):
+        rows = math.ceil(count / columns)
+        cell = min((width // columns - TILE_GAP) // maze_width,
+                   (height // rows - TILE_GAP - LABEL_HEIGHT) // maze_height)
+        if cell > best[2]:
+            best = (columns, rows, cell)
+    return best
+
+class Tile:
+    def __init__(self, index, rect):
+        """One game's thumbnail: its place in the window and what it last showed"""
+        self.index = index
+        self.rect = rect
+        self.board = None  # Maze layer plus the pellets still on the board
+        self.board_map = None
+        self.board_bits = None
+        self.ticks = 0
+        self.finished = 0
+        self.rate = 0.0  # Ticks per second
+        self.seen = None  # (ticks, time) at the last refresh
+
+class Monitor:
+    def __init__(self, games, workers=None, autopilot=False, tile_fps=TILE_FPS):
+        """Run headless games in worker processes and show them as thumbnails"""
+        self.count = games
+        self.workers = max(1, min(games, workers or (os.cpu_count() or 2) - 1))
+        self.autopilot = autopilot
+        self.stride = max(1, round(MONITOR_FPS / tile_fps))  # Frames between redraws of a tile
+
+        # A headless mirror of every game, restored from its snapshots
+        self.mirrors = [Game() for _ in range(games)]
+        self.codec = StateCodec.for_game(self.mirrors[0])
+        self.slot_size = HEADER.size + self.codec.size
+        self.maze_size = (self.mirrors[0].map.width, self.mirrors[0].map.height)
+
+        self.memory = None
+        self.processes = []
+        self.stop = None
+        self.exit_codes = {}  # Exit code of every worker that died, by worker number
+        self.window = None
+        self.tiles = []
+        self.cell = 0
+        self.mazes = {}  # Thumbnail wall layers by (maze key, cell size)
+        self.zoomed = None  # Index of the game shown in full detail
+        self.viewport = None
+        self.detail = None  # Game drawing the zoomed view
+        self.frame = 0
+
+        # Stats
+        self.frames = 0
+        self.draw_time = 0.0
+
+    def start(self):
+        """Create the shared memory and start the worker processes"""
+        self.memory = shared_memory.SharedMemory(create=True, size=self.slot_size * self.count)
+        self.memory.buf[:] = bytes(len(self.memory.buf))
+        # Spawned workers start clean instead of inheriting the window
+        context = multiprocessing.get_context("spawn")
+        self.stop = context.Event()
+        for worker in range(self.workers):
+            game_ids = list(range(worker, self.count, self.workers))
+            process = context.Process(target=_play, name=f"monitor-worker-{worker}", daemon=True,
+                                      args=(self.memory.name, game_ids, self.slot_size, self.autopilot, self.stop))
+            process.start()
+            self.processes.append(process)
+
+    def close(self):
+        """Stop the workers and free the shared memory"""
+        if self.stop is not None:
+            self.stop.set()
+        for process in self.processes:
+            process.join(timeout=2)
+            if process.is_alive():
+                process.terminate()
+        self.processes = []
+        if self.memory is not None:
+            self.memory.close()
+            self.memory.unlink()
+            self.memory = None
+
+    def check_workers(self):
+        """Notice workers that died (their games stop), reporting each once"""
+        for number, process in enumerate(self.processes):
+            if number not in self.exit_codes and not process.is_alive():
+                self.exit_codes[number] = process.exitcode
+                games = ", ".join(str(index) for index in range(number, self.count, self.workers))
+                print(f"monitor: worker {number} died with exit code {process.exitcode} (games {games})")
+
+    def worker_exit_code(self, index):
+        """Exit code of the dead worker that ran a game (None while it runs)"""
+        return self.exit_codes.get(index % self.workers)
+
+    def throughput(self):
+        """Ticks played so far by every game together"""
+        total = 0
+        for index in range(self.count):
+            data = read_slot(self.memory.buf, index * self.slot_size, self.slot_size)
+            if data is not None:
+                total += HEADER.unpack_from(data)[1]
+        return total
+
+    def open(self, window):
+        """Start drawing into a window surface"""
+        self.window = window
+        self.font = pygame.font.Font(None, LABEL_HEIGHT + 4)
+        self.viewport = Viewport(window, (SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.layout()
+
+    def layout(self):
+        """Place the tiles for the current window size and redraw everything"""
+        width, height = self.window.get_size()
+        columns, rows, self.cell = mosaic_layout(self.count, (width, height), self.maze_size)
+        tile_width = self.maze_size[0] * self.cell
+        tile_height = self.maze_size[1] * self.cell + LABEL_HEIGHT
+        self.tiles = []
+        for index in range(self.count):
+            row, column = divmod(index, columns)
+            rect = pygame.Rect(column * (width // columns) + TILE_GAP // 2,
+                               row * (height // rows) + TILE_GAP // 2, tile_width, tile_height)
+            self.tiles.append(Tile(index, rect))
+        self.window.fill(BLACK)
+        self.viewport.resize(self.window)
+        self.frame = 0
+
+    def update_mirror(self, index):
+        """Restore a game's latest snapshot into its mirror (False if none could be read)"""
+        data = read_slot(self.memory.buf, index * self.slot_size, self.slot_size)
+        if data is None:
+            return False
+        tile = self.tiles[index]
+        _, tile.ticks, tile.finished = HEADER.unpack_from(data)
+        self.codec.restore(self.mirrors[index], data, HEADER.size)
+        return True
+
+    def maze_layer(self, game_map):
+        """Thumbnail of a maze's walls, drawn once per maze and tile size"""
+        key = (game_map.compiled.key, self.cell)
+        layer = self.mazes.get(key)
+        if layer is None:
+            layer = pygame.Surface((game_map.width * self.cell, game_map.height * self.cell), 0, self.window)
+            layer.fill(BLACK)
+            for x, y in game_map.compiled.walls:
+                layer.fill(BLUE, (x * self.cell, y * self.cell, self.cell, self.cell))
+            self.mazes[key] = layer
+        return layer
+
+    def draw_tile(self, tile, now):
+        """Redraw one thumbnail from its mirror"""
+        exit_code = self.worker_exit_code(tile.index)
+        if not self.update_mirror(tile.index):
+            if exit_code is None:
+                return False
+            # Died before publishing anything: there is only the label to show
+            self.draw_label(tile, f"#{tile.index} WORKER DIED (exit {exit_code})", RED)
+            return True
+        game = self.mirrors[tile.index]
+        game_map = game.map
+        cell = self.cell
+
+        # Walls and pellets change rarely: redraw them only when they do
+        if tile.board_map is not game_map or tile.board_bits != game_map.pellet_bits:
+            if tile.board is None or tile.board_map is not game_map:
+                tile.board = self.maze_layer(game_map).copy()
+            else:
+                tile.board.blit(self.maze_layer(game_map), (0, 0))
+            dot = max(1, cell // 4)
+            for (x, y), (cell_value, _) in game_map.pellet_cells.items():
+                if game_map.pellet_bits >> (y * game_map.width + x) & 1:
+                    size = dot * 2 if cell_value == 3 else dot
+                    tile.board.fill(WHITE, (x * cell + (cell - size) // 2, y * cell + (cell - size) // 2, size, size))
+            tile.board_map = game_map
+            tile.board_bits = game_map.pellet_bits
+        self.window.blit(tile.board, tile.rect.topleft)
+
+        # Entity markers
+        scale = cell / game_map.cell_size
+        radius = max(1, cell // 2)
+        for ghost, color in zip(game.ghosts, GHOST_COLORS):
+            center = (tile.rect.x + int(ghost.x * scale), tile.rect.y + int(ghost.y * scale))
+            pygame.draw.circle(self.window, FRIGHTENED if ghost.frightened else color, center, radius)
+        center = (tile.rect.x + int(game.pacman.x * scale), tile.rect.y + int(game.pacman.y * scale))
+        pygame.draw.circle(self.window, YELLOW, center, radius)
+
+        # Counters (a game whose worker died stays frozen, framed in red)
+        if exit_code is not None:
+            pygame.draw.rect(self.window, RED, (tile.rect.topleft, tile.board.get_size()), 2)
+            self.draw_label(tile, f"#{tile.index} WORKER DIED (exit {exit_code}) L{game.level} {game.score}", RED)
+            return True
+        if tile.seen is not None and now > tile.seen[1]:
+            tile.rate = (tile.ticks - tile.seen[0]) / (now - tile.seen[1])
+        tile.seen = (tile.ticks, now)
+        self.draw_label(tile, f"#{tile.index} L{game.level} {game.score} x{game.lives} "
+                              f"{tile.rate / 1000:.1f}k t/s {tile.finished} done", WHITE)
+        return True
+
+    def draw_label(self, tile, text, color):
+        """Write a line of counters under a thumbnail"""
+        label = pygame.Rect(tile.rect.x, tile.rect.bottom - LABEL_HEIGHT, tile.rect.width, LABEL_HEIGHT)
+        self.window.fill(BLACK, label)
+        self.window.blit(self.font.render(text, True, color), label.topleft, ((0, 0), label.size))
+
+    def draw_mosaic(self):
+        """Redraw this frame's share of the tiles and return the rects that changed"""
+        now = time.perf_counter()
+        dirty = []
+        for tile in self.tiles[self.frame % self.stride::self.stride]:
+            if self.draw_tile(tile, now):
+                dirty.append(tile.rect)
+        self.frame += 1
+        return dirty
+
+    def draw_zoomed(self):
+        """Draw the zoomed game with the regular game drawing, scaled to the window"""
+        if self.detail is None:
+            self.detail = Game(self.viewport.target)
+        data = read_slot(self.memory.buf, self.zoomed * self.slot_size, self.slot_size)
+        if data is not None:
+            self.codec.restore(self.detail, data, HEADER.size)
+        self.detail.draw()
+        exit_code = self.worker_exit_code(self.zoomed)
+        if exit_code is not None:
+            self.detail.ui.draw_text(f"WORKER DIED (exit {exit_code})", self.detail.ui.medium_font, RED,
+                                     SCREEN_WIDTH // 2, 20)
+        self.viewport.present()
+
+    def handle_events(self):
+        """Process window events; returns False once the monitor should close"""
+        for event in pygame.event.get():
+            if event.type == QUIT:
+                return False
+            if event.type == VIDEORESIZE:
+                self.window = pygame.display.get_surface()
+                self.layout()
+            elif event.type == KEYDOWN and event.key == K_ESCAPE:
+                if self.zoomed is None:
+                    return False
+                self.zoom(None)
+            elif event.type == MOUSEBUTTONDOWN and event.button == 1:
+                if self.zoomed is not None:
+                    self.zoom(None)
+                else:
+                    for tile in self.tiles:
+                        if tile.rect.collidepoint(event.pos):
+                            self.zoom(tile.index)
+                            break
+        return True
+
+    def zoom(self, index):
+        """Show one game in full detail (None: back to the mosaic)"""
+        self.zoomed = index
+        caption = 'Pac-Man monitor' if index is None else f'Pac-Man monitor - game {index}'
+        pygame.display.set_caption(caption)
+        self.window.fill(BLACK)
+        if index is None:
+            # Every tile at once, so the mosaic is complete straight away
+            now = time.perf_counter()
+            for tile in self.tiles:
+                self.draw_tile(tile, now)
+            pygame.display.flip()
+
+    def run(self, seconds=None):
+        """Show the games until the window is closed (or for a number of seconds)"""
+        clock = pygame.time.Clock()
+        end = None if seconds is None else time.perf_counter() + seconds
+        while self.handle_events() and (end is None or time.perf_counter() < end):
+            self.check_workers()
+            start = time.perf_counter()
+            if self.zoomed is None:
+                dirty = self.draw_mosaic()
+                if dirty:
+                    pygame.display.update(dirty)
+            else:
+                self.draw_zoomed()
+                pygame.display.flip()
+            self.draw_time += time.perf_counter() - start
+            self.frames += 1
+            clock.tick(MONITOR_FPS)
+
+    def report(self):
+        """Monitor drawing cost as a short text summary"""
+        mean = self.draw_time / self.frames * 1000 if self.frames else 0.0
+        text = f"monitor: {self.count} games on {self.workers} workers, {self.frames} frames, {mean:.2f} ms per frame"
+        if self.exit_codes:
+            text += ", dead workers: " + ", ".join(
+                f"{number} (exit {code})" for number, code in sorted(self.exit_codes.items()))
+        return text
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", type=int, default=16, help="games to run and watch")
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per core, less one)")
+    parser.add_argument("--autopilot", action="store_true", help="let Pac-Man play himself (default: random turns)")
+    parser.add_argument("--tile-fps", type=float, default=TILE_FPS, help="times per second each thumbnail is redrawn")
+    args = parser.parse_args()
+
+    monitor = Monitor(args.games, args.workers, args.autopilot, args.tile_fps)
+    monitor.start()
+    try:
+        # Workers keep their priority; only the monitor steps back
+        if hasattr(os, "nice"):
+            os.nice(MONITOR_NICENESS)
+        pygame.display.init()
+        pygame.font.init()
+        window = pygame.display.set_mode(WINDOW_SIZE, RESIZABLE)
+        pygame.display.set_caption('Pac-Man monitor')
+        monitor.open(window)
+        start = time.perf_counter()
+        try:
+            monitor.run()
+        except KeyboardInterrupt:
+            pass
+        elapsed = time.perf_counter() - start
+        print(monitor.report())
+        print(f"games: {monitor.throughput() / elapsed:.0f} ticks/s in total")
+    finally:
+        monitor.close()
+        pygame.quit()
+
+if __name__ == "__main__":
+    main()
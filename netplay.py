@@ -0,0 +1,358 @@
+"""Stream headless games to remote spectators over asyncio.
+
+The server runs any number of headless Game instances and sends each
+watcher a full state when it joins, then one small JSON line per tick with
+only what changed (moved entities, eaten pellets, score, lives, ...).
+Watchers can also send directions to steer Pac-Man.
+
+    python netplay.py serve --games 4 --autopilot
+    python netplay.py watch --game 2
+"""
+import argparse
+import asyncio
+import json
+import time
+
+import pygame
+from pygame.locals import *
+
+from main import Game, FPS
+from autopilot import Autopilot
+from snapshot import DIRECTIONS, DIRECTION_CODES
+
+DEFAULT_PORT = 8765
+WRITE_HIGH_WATER = 64 * 1024  # Bytes queued for a watcher before it is resynced
+
+def _dumps(message):
+    """Encode a message as one compact JSON line"""
+    return json.dumps(message, separators=(",", ":")).encode() + b"\n"
+
+def _entity(entity, *extra):
+    """Compact wire form of Pac-Man or a ghost"""
+    return [entity.x, entity.y, DIRECTION_CODES[entity.direction], *extra]
+
+class HostedGame:
+    def __init__(self, game_id, autopilot=False, restart=True):
+        """A headless game plus what its watchers were last sent"""
+        self.id = game_id
+        self.game = Game()
+        self.game.state = "PLAYING"
+        if autopilot:
+            self.game.autopilot = Autopilot()
+        self.restart = restart
+        self.watchers = set()
+        self.tick = 0
+        self._remember()
+
+    def _remember(self):
+        """Record the state the next delta is computed against"""
+        game = self.game
+        self.last_map = game.map
+        self.last_pacman = _entity(game.pacman)
+        self.last_ghosts = [_entity(ghost, ghost.frightened) for ghost in game.ghosts]
+        self.last_pellets = game.map.pellet_bits
+        self.last_counters = (game.score, game.lives, game.level, game.state)
+
+    def full_state(self):
+        """Message with everything a new watcher needs"""
+        game = self.game
+        return {
+            "full": self.tick,
+            "id": self.id,
+            "pellets": hex(game.map.pellet_bits),
+            "pacman": _entity(game.pacman),
+            "ghosts": [_entity(ghost, ghost.frightened) for ghost in game.ghosts],
+            "score": game.score,
+            "lives": game.lives,
+            "level": game.level,
+            "state": game.state,
+        }
+
+    def step(self):
+        """Advance one tick and return the encoded delta (None if nothing changed)"""
+        game = self.game
+        if game.state in ("GAME_OVER", "WIN") and self.restart:
+            game.reset_game()
+            game.state = "PLAYING"
+        game.update()
+        self.tick += 1
+
+        if game.map is not self.last_map:
+            # New map: watchers need a fresh full state
+            message = self.full_state()
+            self._remember()
+            return _dumps(message)
+
+        delta = {}
+        pacman = _entity(game.pacman)
+        if pacman != self.last_pacman:
+            delta["p"] = pacman
+            self.last_pacman = pacman
+
+        moved = {}
+        for i, ghost in enumerate(game.ghosts):
+            wire = _entity(ghost, ghost.frightened)
+            if wire != self.last_ghosts[i]:
+                moved[i] = wire
+                self.last_ghosts[i] = wire
+        if moved:
+            delta["g"] = moved
+
+        pellets = game.map.pellet_bits
+        if pellets != self.last_pellets:
+            eaten = self.last_pellets & ~pellets
+            delta["e"] = [index for index in range(eaten.bit_length()) if eaten >> index & 1]
+            restored = pellets & ~self.last_pellets
+            if restored:
+                delta["r"] = [index for index in range(restored.bit_length()) if restored >> index & 1]
+            self.last_pellets = pellets
+
+        counters = (game.score, game.lives, game.level, game.state)
+        if counters != self.last_counters:
+            delta["c"] = counters
+            self.last_counters = counters
+
+        if not delta:
+            return None
+        delta["t"] = self.tick
+        return _dumps(delta)
+
+class Watcher:
+    def __init__(self, reader, writer):
+        """A connected spectator"""
+        self.reader = reader
+        self.writer = writer
+        self.game = None
+        self.stale = False  # Fell behind; gets a full state once caught up
+        self.bytes_sent = 0
+
+    def send(self, data):
+        """Queue data for the watcher"""
+        self.writer.write(data)
+        self.bytes_sent += len(data)
+
+class GameServer:
+    def __init__(self, num_games=1, fps=FPS, autopilot=False, restart=True):
+        """Host headless games and stream their changes to watchers
+
+        fps=None ticks as fast as possible (for benchmarks).
+        """
+        self.games = [HostedGame(i, autopilot, restart) for i in range(num_games)]
+        self.fps = fps
+        self.server = None
+        self.handlers = set()
+        self.ticks = 0
+        self.tick_time = 0.0
+        self.bytes_sent = 0
+        self.messages_sent = 0
+
+    async def start(self, host="127.0.0.1", port=DEFAULT_PORT):
+        """Start listening and return the bound port"""
+        self.server = await asyncio.start_server(self._handle, host, port)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        """Stop listening and disconnect everyone"""
+        if self.server is not None:
+            self.server.close()
+        for handler in list(self.handlers):
+            handler.cancel()
+        await asyncio.gather(*self.handlers, return_exceptions=True)
+        if self.server is not None:
+            await self.server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        """Serve one watcher: a {"watch": id} request, then direction inputs"""
+        watcher = Watcher(reader, writer)
+        handler = asyncio.current_task()
+        self.handlers.add(handler)
+        try:
+            request = json.loads(await reader.readline())
+            if not isinstance(request, dict):
+                return
+            hosted = self.games[request.get("watch", 0) % len(self.games)]
+            watcher.game = hosted
+            watcher.send(_dumps(hosted.full_state()))
+            hosted.watchers.add(watcher)
+
+            async for line in reader:
+                message = json.loads(line)
+                direction = message.get("dir") if isinstance(message, dict) else None
+                if direction in DIRECTIONS[1:]:  # Any real direction (not None)
+                    hosted.game.pacman.change_direction(direction)
+        except (ConnectionError, ValueError, TypeError, AttributeError, asyncio.CancelledError):
+            pass
+        finally:
+            if watcher.game is not None:
+                watcher.game.watchers.discard(watcher)
+            self.handlers.discard(handler)
+            writer.close()
+
+    def tick(self):
+        """Advance every game one tick and broadcast the deltas"""
+        start = time.perf_counter()
+        for hosted in self.games:
+            data = hosted.step()
+            for watcher in hosted.watchers:
+                buffered = watcher.writer.transport.get_write_buffer_size()
+                if watcher.stale:
+                    if buffered < WRITE_HIGH_WATER // 2:
+                        watcher.stale = False
+                        watcher.send(_dumps(hosted.full_state()))
+                elif buffered > WRITE_HIGH_WATER:
+                    watcher.stale = True  # Skip deltas until it drains
+                elif data is not None:
+                    watcher.send(data)
+                    self.bytes_sent += len(data)
+                    self.messages_sent += 1
+        self.ticks += 1
+        self.tick_time += time.perf_counter() - start
+
+    async def run(self, ticks=None):
+        """Tick at the configured rate (forever, or for a number of ticks)"""
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        while ticks is None or self.ticks < ticks:
+            self.tick()
+            if self.fps is None:
+                await asyncio.sleep(0)
+            else:
+                next_tick += 1 / self.fps
+                await asyncio.sleep(max(0.0, next_tick - loop.time()))
+
+class SpectatorClient:
+    def __init__(self, screen=None):
+        """Mirror of a remote game, drawn with the regular Game drawing code"""
+        self.game = Game(screen)
+        self.reader = None
+        self.writer = None
+        self.tick = 0
+        self.bytes_received = 0
+        self.messages = 0
+
+    async def connect(self, host="127.0.0.1", port=DEFAULT_PORT, game_id=0):
+        """Connect and ask to watch a game"""
+        self.reader, self.writer = await asyncio.open_connection(host, port)
+        self.writer.write(_dumps({"watch": game_id}))
+        await self.writer.drain()
+
+    async def receive(self):
+        """Read and apply one message; returns False when the server is gone"""
+        line = await self.reader.readline()
+        if not line:
+            return False
+        self.bytes_received += len(line)
+        self.messages += 1
+        self.apply(json.loads(line))
+        return True
+
+    def send_direction(self, direction):
+        """Steer the remote Pac-Man"""
+        self.writer.write(_dumps({"dir": direction}))
+
+    def apply(self, message):
+        """Update the mirror from a full state or delta message"""
+        game = self.game
+        if "full" in message:
+            if message["level"] != game.level:
+                game.start_level(message["level"])  # Build that level's maze
+            self.tick = message["full"]
+            game.map.set_pellet_bits(int(message["pellets"], 16))
+            self._set_entity(game.pacman, message["pacman"])
+            for ghost, wire in zip(game.ghosts, message["ghosts"]):
+                self._set_entity(ghost, wire)
+            game.score, game.lives, game.level, game.state = (
+                message["score"], message["lives"], message["level"], message["state"]
+            )
+            return
+
+        self.tick = message["t"]
+        if "p" in message:
+            self._set_entity(game.pacman, message["p"])
+        for index, wire in message.get("g", {}).items():
+            self._set_entity(game.ghosts[int(index)], wire)
+
+        if "e" in message or "r" in message:
+            bits = game.map.pellet_bits
+            for index in message.get("e", ()):
+                bits &= ~(1 << index)
+            for index in message.get("r", ()):
+                bits |= 1 << index
+            game.map.set_pellet_bits(bits)
+
+        if "c" in message:
+            game.score, game.lives, game.level, game.state = message["c"]
+
+    def _set_entity(self, entity, wire):
+        """Place Pac-Man or a ghost from its wire form"""
+        entity.x, entity.y = wire[0], wire[1]
+        entity.direction = DIRECTIONS[wire[2]]
+        if len(wire) > 3:
+            entity.frightened = wire[3]
+        entity.rect.center = (entity.x, entity.y)
+
+    async def close(self):
+        """Disconnect"""
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except ConnectionError:
+                pass
+
+async def watch(host, port, game_id):
+    """Open a window showing a remote game; arrow keys steer it"""
+    from main import init_display
+    screen = init_display()
+    pygame.display.set_caption(f'Pac-Man - watching game {game_id}')
+    client = SpectatorClient(screen)
+    await client.connect(host, port, game_id)
+
+    async def pump():
+        while await client.receive():
+            pass
+
+    receiver = asyncio.create_task(pump())
+    keys = {K_UP: "UP", K_DOWN: "DOWN", K_LEFT: "LEFT", K_RIGHT: "RIGHT"}
+    running = True
+    while running and not receiver.done():
+        for event in pygame.event.get():
+            if event.type == QUIT or (event.type == KEYDOWN and event.key == K_ESCAPE):
+                running = False
+            elif event.type == KEYDOWN and event.key in keys:
+                client.send_direction(keys[event.key])
+        client.game.draw()
+        pygame.display.flip()
+        await asyncio.sleep(1 / FPS)
+
+    receiver.cancel()
+    await client.close()
+    pygame.quit()
+
+async def serve(host, port, num_games, autopilot):
+    """Run a server until interrupted"""
+    server = GameServer(num_games, autopilot=autopilot)
+    port = await server.start(host, port)
+    print(f"serving {num_games} game(s) on {host}:{port}")
+    try:
+        await server.run()
+    finally:
+        await server.close()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("mode", choices=["serve", "watch"])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--games", type=int, default=1, help="games to host (serve)")
+    parser.add_argument("--autopilot", action="store_true", help="let hosted games play themselves (serve)")
+    parser.add_argument("--game", type=int, default=0, help="game to watch (watch)")
+    args = parser.parse_args()
+
+    if args.mode == "serve":
+        asyncio.run(serve(args.host, args.port, args.games, args.autopilot))
+    else:
+        asyncio.run(watch(args.host, args.port, args.game))
+
+if __name__ == "__main__":
+    main()
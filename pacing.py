@@ -0,0 +1,107 @@
+import time
+
+# Frame pacing
+MAX_CATCH_UP = 5  # Most updates run in one frame; beyond that the game is allowed to slow down
+MAX_SKIPPED = 4  # Frames skipped in a row before one is drawn anyway
+DEGRADE_AT = 0.6  # Render cost (share of a frame) that turns effects off
+RESTORE_AT = 0.3  # Render cost (share of a frame) that turns them back on
+DEGRADE_HOLD = 120  # Drawn frames effects stay off before they are tried again (doubles every time)
+SMOOTHING = 0.1  # Weight of the latest frame in the average render cost
+POLL_INTERVAL = 0.001  # Seconds between input checks while waiting
+
+class FramePacer:
+    def __init__(self, fps, clock=time.perf_counter):
+        """Run updates at a fixed rate and draw only when there is time for it
+
+        Updates are scheduled on their own clock, so a slow frame is made
+        up for by running the missed updates next frame instead of slowing
+        the game down. Drawing (and the display flip) is skipped when its
+        measured cost would run past the next update, and the pulsing
+        effects are turned off while drawing takes most of a frame.
+        """
+        self.frame_time = 1.0 / fps
+        self.clock = clock
+        self.next_update = None
+        self.due_from = None  # Scheduled time of the first update due this frame
+        self.render_cost = 0.0  # Average seconds per drawn frame
+        self.effects = True  # Animated effects on (False while degraded)
+        self.hold = 0  # Drawn frames left before effects may come back
+        self.skipped_in_row = 0
+
+        # Stats
+        self.frames = 0
+        self.updates = 0
+        self.skipped = 0
+        self.degradations = 0
+        self.slowdowns = 0  # Frames too far behind to catch up
+
+    def updates_due(self):
+        """Number of updates to run this frame"""
+        now = self.clock()
+        if self.next_update is None:
+            self.next_update = now
+
+        self.due_from = self.next_update
+        due = 0
+        while self.next_update <= now and due < MAX_CATCH_UP:
+            due += 1
+            self.next_update += self.frame_time
+        if self.next_update <= now:
+            # Hopelessly behind (updates themselves are too slow): start over from now
+            self.slowdowns += 1
+            self.next_update = now + self.frame_time
+        self.updates += due
+        return due
+
+    def should_draw(self, urgent=False):
+        """Check if this frame should be drawn (call after the updates)
+
+        urgent frames (showing fresh input) are drawn even when late; the
+        updates they delay are caught up next frame.
+        """
+        self.frames += 1
+        late = self.clock() + self.render_cost > self.next_update
+        if late and not urgent and self.skipped_in_row < MAX_SKIPPED:
+            self.skipped += 1
+            self.skipped_in_row += 1
+            return False
+        self.skipped_in_row = 0
+        return True
+
+    def frame_drawn(self, seconds):
+        """Record how long drawing (and flipping) a frame took"""
+        self.render_cost += (seconds - self.render_cost) * SMOOTHING
+        share = self.render_cost / self.frame_time
+        if self.effects and share > DEGRADE_AT:
+            self.effects = False
+            self.degradations += 1
+            # Drawing is cheaper without them, so wait a while (longer every
+            # time) before trying them again rather than flickering
+            self.hold = DEGRADE_HOLD << min(self.degradations - 1, 5)
+        elif not self.effects:
+            self.hold -= 1
+            if self.hold <= 0 and share < RESTORE_AT:
+                self.effects = True
+
+    def wait(self, idle=None):
+        """Sleep until the next update is due, calling idle about every POLL_INTERVAL"""
+        while True:
+            delay = self.next_update - self.clock()
+            if delay <= 0:
+                break
+            if idle is None:
+                time.sleep(delay)
+                break
+            idle()
+            time.sleep(min(delay, POLL_INTERVAL))
+
+    def status(self):
+        """Short on-screen summary of the degradation counters"""
+        return f"SKIPPED {self.skipped}  LOW FX {self.degradations}"
+
+    def report(self):
+        """Pacing statistics as a short text summary"""
+        drawn = self.frames - self.skipped
+        return (f"pacing: {self.updates} updates, {drawn} of {self.frames} frames drawn "
+                f"({self.skipped} skipped), effects reduced {self.degradations} times, "
+                f"{self.slowdowns} slowdowns, render cost {self.render_cost * 1000:.2f} ms")
@@ -1,9 +1,13 @@
 import pygame
 import math
+import assets
 
 # Colors
 YELLOW = (255, 255, 0)
 
+# Buffered turns: how far past a cell center a turn still snaps back to it
+TURN_GRACE = 6
+
 class PacMan:
     def __init__(self, start_pos, cell_size):
         """Initialize Pac-Man with starting position and properties"""
@@ -12,6 +16,8 @@ class PacMan:
         self.x, self.y = start_pos
         self.direction = "RIGHT"  # Initial direction
         self.next_direction = None  # Direction to change to when possible
+        self.turn_buffer = None  # Ticks a queued turn waits for a cell center (None: turn wherever possible)
+        self.turn_age = 0
         self.speed = 2
         self.animation_timer = 0
         self.mouth_angle = 45  # Mouth opening angle in degrees
@@ -28,10 +34,10 @@ class PacMan:
         # Try to load Pac-Man sprites
         try:
             self.sprites = {
-                "RIGHT": pygame.image.load('assets/images/pacman_right.png'),
-                "LEFT": pygame.image.load('assets/images/pacman_left.png'),
-                "UP": pygame.image.load('assets/images/pacman_up.png'),
-                "DOWN": pygame.image.load('assets/images/pacman_down.png')
+                "RIGHT": assets.load_image('assets/images/pacman_right.png'),
+                "LEFT": assets.load_image('assets/images/pacman_left.png'),
+                "UP": assets.load_image('assets/images/pacman_up.png'),
+                "DOWN": assets.load_image('assets/images/pacman_down.png')
             }
             for direction, sprite in self.sprites.items():
                 self.sprites[direction] = pygame.transform.scale(
@@ -44,12 +50,15 @@ class PacMan:
     def change_direction(self, new_direction):
         """Change Pac-Man's direction or queue it for the next valid position"""
         self.next_direction = new_direction
+        self.turn_age = 0
     
     def update(self, game_map):
         """Update Pac-Man's position and animation"""
         # Try to change to the queued direction if possible
         if self.next_direction:
-            if self.can_move(self.next_direction, game_map):
+            if self.turn_buffer is not None:
+                self.take_buffered_turn(game_map)
+            elif self.can_move(self.next_direction, game_map):
                 self.direction = self.next_direction
                 self.next_direction = None
         
@@ -62,10 +71,108 @@ class PacMan:
             # Update rect position
             self.rect.center = (self.x, self.y)
         
-        # Update mouth animation
-        self.animation_timer += 1
-        if self.animation_timer >= 5:
-            self.animation_timer = 0
+        self.animate()
+    
+    def take_buffered_turn(self, game_map):
+        """Take the queued turn at a cell center (or just past one), or let it expire
+        
+        Reversing (or going on) is done at once. A turn sideways waits for
+        the center of a cell with an open neighbour that way; if Pac-Man
+        is up to TURN_GRACE past that center he is put back on it, so a
+        key pressed a little late still takes the corner.
+        """
+        dx, dy = self.get_direction_vector(self.direction)
+        turn_x, turn_y = self.get_direction_vector(self.next_direction)
+        if turn_x * dx + turn_y * dy != 0 or dx == dy == 0:
+            if self.can_move(self.next_direction, game_map):
+                self.direction = self.next_direction
+                self.next_direction = None
+                return
+        else:
+            grid_x = int(self.x // self.cell_size)
+            grid_y = int(self.y // self.cell_size)
+            center_x = grid_x * self.cell_size + self.cell_size // 2
+            center_y = grid_y * self.cell_size + self.cell_size // 2
+            past_center = (self.x - center_x) * dx + (self.y - center_y) * dy
+            next_x, next_y = grid_x + turn_x, grid_y + turn_y
+            open_side = (0 <= next_x < game_map.width and 0 <= next_y < game_map.height and
+                         game_map.layout[next_y][next_x] != 1)
+            if open_side and 0 <= past_center <= TURN_GRACE:
+                self.x, self.y = center_x, center_y
+                self.rect.center = (self.x, self.y)
+                self.direction = self.next_direction
+                self.next_direction = None
+                return
+        
+        # Still waiting: forget it once the buffer runs out
+        self.turn_age += 1
+        if self.turn_age > self.turn_buffer:
+            self.next_direction = None
+    
+    def quiet_ticks(self, game_map, limit, stop_at_centers=False):
+        """Ticks (up to limit) that update() would spend only moving straight on
+        
+        Pac-Man has to be able to keep going, not be able to take a queued
+        turn, and stay inside his current cell, so no pellet is reached.
+        Standing still against a wall is quiet for as long as it lasts.
+        With stop_at_centers (for autopilots) the count also ends at the
+        next cell center and when he is blocked.
+        """
+        cell_size = self.cell_size
+        grid_x = int(self.x // cell_size)
+        grid_y = int(self.y // cell_size)
+        if game_map.layout[grid_y][grid_x] in (2, 3):
+            return 0
+        if self.turn_buffer is not None:
+            if self.next_direction:
+                return 0  # Buffered turns are short-lived, so just tick through them
+            stop_at_centers = True  # He may have to stop at the next one
+        
+        dx, dy = self.get_direction_vector(self.direction)
+        if dx == dy == 0 or not self.can_move(self.direction, game_map):
+            if stop_at_centers or (self.next_direction and self.can_move(self.next_direction, game_map)):
+                return 0
+            return limit
+        
+        # A queued turn sideways is possible all along the cell or nowhere in
+        # it; any other queued direction is taken right away
+        if self.next_direction:
+            turn_x, turn_y = self.get_direction_vector(self.next_direction)
+            if turn_x * dx + turn_y * dy != 0 or self.can_move(self.next_direction, game_map):
+                return 0
+        
+        # Work along the axis of motion; every move that stays inside the
+        # (open) cell is allowed, so ticks end where Pac-Man would leave it
+        position, cell_start = (self.x, grid_x * cell_size) if dx else (self.y, grid_y * cell_size)
+        forward = dx or dy
+        if forward > 0:
+            ticks = math.ceil((cell_start + cell_size - position) / self.speed) - 1
+        else:
+            ticks = int((position - cell_start) // self.speed)
+        
+        if stop_at_centers:
+            to_center = (cell_start + cell_size // 2 - position) * forward
+            if to_center == 0:
+                return 0
+            if to_center > 0 and to_center % self.speed == 0:
+                ticks = min(ticks, int(to_center // self.speed))
+        return max(0, min(ticks, limit))
+    
+    def advance(self, ticks, moving=True):
+        """Do ticks straight-ahead (or standing still) updates at once (see quiet_ticks)"""
+        if moving:
+            dx, dy = self.get_direction_vector(self.direction)
+            self.x += dx * self.speed * ticks
+            self.y += dy * self.speed * ticks
+            self.rect.center = (self.x, self.y)
+        self.animate(ticks)
+    
+    def animate(self, ticks=1):
+        """Advance the mouth animation by some ticks"""
+        # The mouth moves once every 5 ticks
+        self.animation_timer += ticks
+        moves, self.animation_timer = divmod(self.animation_timer, 5)
+        for _ in range(moves):
             self.mouth_angle += 5 * self.mouth_direction
             
             if self.mouth_angle >= 45:
@@ -75,16 +182,35 @@ class PacMan:
     
     def can_move(self, direction, game_map):
         """Check if Pac-Man can move in the specified direction"""
+        return self.can_move_from(self.x, self.y, direction, game_map)
+    
+    def can_move_from(self, x, y, direction, game_map):
+        """Check if Pac-Man could move in a direction from a given position
+        
+        Testing only the end point is enough for steps up to a cell: the
+        path cannot skip over a whole wall cell. With a turn buffer Pac-Man
+        also stops at the center of a cell in front of a wall.
+        """
         dx, dy = self.get_direction_vector(direction)
         
         # Calculate the position after movement
-        new_x = self.x + dx * self.speed
-        new_y = self.y + dy * self.speed
+        new_x = x + dx * self.speed
+        new_y = y + dy * self.speed
         
         # Check if the new position would be inside a wall
         if game_map.is_wall((new_x, new_y)):
             return False
         
+        if self.turn_buffer is not None and (dx or dy):
+            grid_x = int(x // self.cell_size)
+            grid_y = int(y // self.cell_size)
+            center_x = grid_x * self.cell_size + self.cell_size // 2
+            center_y = grid_y * self.cell_size + self.cell_size // 2
+            past_center = (new_x - center_x) * dx + (new_y - center_y) * dy
+            ahead = (center_x + dx * self.cell_size, center_y + dy * self.cell_size)
+            if past_center > 0 and game_map.is_wall(ahead):
+                return False
+        
         return True
     
     def get_direction_vector(self, direction):
@@ -0,0 +1,175 @@
+import sys
+import numpy as np
+import pygame
+
+# Colors for each kind of cell (picked to stay distinct in grayscale too)
+COLORS = {
+    "empty": (0, 0, 0),
+    "wall": (0, 0, 255),
+    "pellet": (255, 255, 255),
+    "power_pellet": (255, 255, 0),
+    "ghost": (255, 0, 0),
+    "frightened_ghost": (0, 255, 255),
+    "pacman": (255, 160, 0),
+}
+
+def to_gray(color):
+    """Convert an RGB color to a gray level of the same luminance"""
+    r, g, b = color
+    level = int(0.299 * r + 0.587 * g + 0.114 * b)
+    return (level, level, level)
+
+class PixelRenderer:
+    def __init__(self, game, size=None, stack=1, grayscale=False):
+        """Render a game into a small off-screen surface for pixel observations
+
+        The map is drawn at one pixel per cell and scaled (nearest neighbor)
+        to size, which defaults to the cell grid size. The result is exposed
+        as a NumPy view of the surface, so rendering allocates nothing.
+        With stack > 1 the last frames are also kept in a ring buffer.
+        """
+        self.game = game
+        self.grid_size = (game.map.width, game.map.height)
+        self.size = size or self.grid_size
+        self.grayscale = grayscale
+
+        # Color lookup (grayscale surfaces use an 8-bit gray palette)
+        if grayscale:
+            self.colors = {name: to_gray(color) for name, color in COLORS.items()}
+        else:
+            self.colors = dict(COLORS)
+
+        # Cell-resolution layers: walls never change, pellets change rarely
+        self.background = self._make_surface(self.grid_size)
+        self.maze = self._make_surface(self.grid_size)
+        self.cells = self._make_surface(self.grid_size)
+        self.surface = self._make_surface(self.size)
+        self._build_background()
+        self.pellets_left = None
+        self.game_map = None
+
+        # Persistent view of the output surface (keeps it locked, which is
+        # fine because it is only ever written by transform.scale)
+        if grayscale:
+            self.pixels = pygame.surfarray.pixels2d(self.surface)
+        else:
+            self.pixels = pygame.surfarray.pixels3d(self.surface)
+
+        # Frame stack stored twice over so the latest frames are always one
+        # contiguous slice (no copying when the stack is read). Frames are
+        # copied as whole packed pixels, which is much faster than copying
+        # the strided RGB view channel by channel.
+        self.stack = stack
+        if stack > 1:
+            self.raw = pygame.surfarray.pixels2d(self.surface)
+            width, height = self.size
+            self.frames = np.zeros((stack * 2, height, width), dtype=self.raw.dtype)
+            if grayscale:
+                self.frame_view = self.frames
+            else:
+                packed = self.frames.view(np.uint8).reshape(stack * 2, height, width, 4)
+                self.frame_view = packed[..., self._rgb_byte_slice()]
+            self.frame_index = 0
+
+    def _make_surface(self, size):
+        """Create a surface in the renderer's pixel format"""
+        if self.grayscale:
+            surface = pygame.Surface(size, depth=8)
+            surface.set_palette([(i, i, i) for i in range(256)])
+        else:
+            surface = pygame.Surface(size)
+        return surface
+
+    def _rgb_byte_slice(self):
+        """Slice selecting R, G, B (in that order) from a packed 32-bit pixel's bytes"""
+        shifts = self.surface.get_shifts()[:3]
+        positions = [shift // 8 for shift in shifts]
+        if sys.byteorder == "big":
+            positions = [3 - position for position in positions]
+
+        red, green, blue = positions
+        if green == red + 1 and blue == red + 2:
+            return slice(red, red + 3)
+        if green == red - 1 and blue == red - 2:
+            return slice(red, red - 3 if red >= 3 else None, -1)
+        raise ValueError(f"Unsupported pixel format with shifts {shifts}")
+
+    def _build_background(self):
+        """Draw the static wall layer"""
+        game_map = self.game.map
+        self.background.fill(self.colors["empty"])
+        wall = self.colors["wall"]
+        for y, row in enumerate(game_map.layout):
+            for x, value in enumerate(row):
+                if value == 1:
+                    self.background.set_at((x, y), wall)
+
+    def _build_maze(self):
+        """Draw walls plus the pellets that are still left"""
+        game_map = self.game.map
+        if game_map is not self.game_map:
+            # New map (reset or new level) may have a different layout
+            self._build_background()
+            self.game_map = game_map
+
+        self.maze.blit(self.background, (0, 0))
+        pellet = self.colors["pellet"]
+        power_pellet = self.colors["power_pellet"]
+        for y, row in enumerate(game_map.layout):
+            for x, value in enumerate(row):
+                if value == 2:
+                    self.maze.set_at((x, y), pellet)
+                elif value == 3:
+                    self.maze.set_at((x, y), power_pellet)
+        self.pellets_left = game_map.count_pellets()
+
+    def _cell(self, x, y):
+        """Grid cell of a pixel position, clamped to the map"""
+        cell_size = self.game.map.cell_size
+        grid_x = min(max(int(x // cell_size), 0), self.grid_size[0] - 1)
+        grid_y = min(max(int(y // cell_size), 0), self.grid_size[1] - 1)
+        return grid_x, grid_y
+
+    def render(self):
+        """Draw the current game state and return the observation view
+
+        Returns the (width, height[, 3]) surfarray view of the output
+        surface, or the (stack, height, width[, 3]) frame stack when
+        stacking. Both are reused by the next call.
+        """
+        game = self.game
+
+        # Only rebuild the maze layer when pellets were eaten
+        if game.map is not self.game_map or game.map.count_pellets() != self.pellets_left:
+            self._build_maze()
+
+        cells = self.cells
+        cells.blit(self.maze, (0, 0))
+
+        for ghost in game.ghosts:
+            color = self.colors["frightened_ghost" if ghost.frightened else "ghost"]
+            cells.set_at(self._cell(ghost.x, ghost.y), color)
+        cells.set_at(self._cell(game.pacman.x, game.pacman.y), self.colors["pacman"])
+
+        pygame.transform.scale(cells, self.size, self.surface)
+
+        if self.stack == 1:
+            return self.pixels
+        return self.push_frame()
+
+    def push_frame(self):
+        """Add the current output to the frame stack and return the stack view"""
+        frame = self.raw.T
+        index = self.frame_index
+        self.frames[index] = frame
+        self.frames[index + self.stack] = frame
+        self.frame_index = (index + 1) % self.stack
+        return self.frame_view[index + 1:index + 1 + self.stack]
+
+    def reset_stack(self):
+        """Fill the whole frame stack with the current frame (call after a reset)"""
+        self.render()
+        if self.stack > 1:
+            self.frames[:] = self.raw.T
+            return self.frame_view[:self.stack]
+        return self.pixels
@@ -0,0 +1,191 @@
+import importlib
+import os
+import random
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+from autopilot import DIRECTIONS, OPPOSITE, at_cell_center
+from snapshot import snapshot, restore
+
+# Rollout scoring
+DEATH_PENALTY = 1000  # Subtracted when Pac-Man loses a life during a rollout
+PELLET_BIAS = 0.75  # Chance the rollout policy takes an adjacent pellet over a random move
+
+# Each pool worker (thread or process) keeps its own headless game
+_local = threading.local()
+
+def _worker_game(ghost_brains=None, turn_buffer=None):
+    """Get this worker's headless game, (re)building it to match the real game's ghosts"""
+    game = getattr(_local, "game", None)
+    if game is None:
+        from main import Game
+        game = _local.game = Game()
+        game.state = "PLAYING"
+        _local.rng = random.Random()
+    if ghost_brains is not None and list(ghost_brains) != game.ghost_brains:
+        game.ghost_brains = list(ghost_brains)
+        game.reset_game()
+        game.state = "PLAYING"
+    game.turn_buffer = game.pacman.turn_buffer = turn_buffer
+    return game, _local.rng
+
+def _load_plugins(plugins):
+    """Pool initializer: import the modules registering extra ghost brains"""
+    for module in plugins:
+        importlib.import_module(module)
+
+def _warm_up():
+    """Create the worker's game ahead of the first decision"""
+    _worker_game()
+
+def _policy(game, rng):
+    """Rollout policy: at cell centers take a random non-reversing exit, favoring pellets"""
+    pacman = game.pacman
+    game_map = game.map
+    cell_size = game_map.cell_size
+    half = cell_size // 2
+    if pacman.x % cell_size != half or pacman.y % cell_size != half:
+        return
+
+    cell = (int(pacman.x // cell_size), int(pacman.y // cell_size))
+    exits = list(game_map.compiled.exits.get(cell, ()))
+    if len(exits) > 1 and OPPOSITE[pacman.direction] in exits:
+        exits.remove(OPPOSITE[pacman.direction])
+
+    if rng.random() < PELLET_BIAS:
+        layout = game_map.layout
+        pellet_exits = [d for d in exits
+                        if layout[cell[1] + DIRECTIONS[d][1]][cell[0] + DIRECTIONS[d][0]] in (2, 3)]
+        if pellet_exits:
+            exits = pellet_exits
+    pacman.change_direction(rng.choice(exits))
+
+def run_rollouts(state, directions, depth, deadline, max_rollouts, seed, ghost_brains=None, turn_buffer=None):
+    """Run rollouts from a snapshot until the (wall clock) deadline
+
+    Cycles through the candidate first directions and returns
+    {direction: [total_value, rollouts]}. ghost_brains and turn_buffer
+    are the real game's, so rollouts play by the same rules.
+    """
+    game, rng = _worker_game(ghost_brains, turn_buffer)
+    rng.seed(seed)
+    game.rng.seed(seed)
+    results = {direction: [0.0, 0] for direction in directions}
+
+    count = 0
+    while count < max_rollouts and time.time() < deadline:
+        direction = directions[count % len(directions)]
+        count += 1
+
+        restore(game, state)
+        start_score = game.score
+        start_lives = game.lives
+        game.pacman.change_direction(direction)
+
+        for tick in range(depth):
+            # Keep the first move until Pac-Man has left the decision cell
+            if tick > 0:
+                _policy(game, rng)
+            game.update()
+            if game.lives != start_lives or game.state != "PLAYING":
+                break
+
+        value = game.score - start_score
+        if game.lives < start_lives:
+            value -= DEATH_PENALTY
+        result = results[direction]
+        result[0] += value
+        result[1] += 1
+
+    return results
+
+class RolloutPlanner:
+    def __init__(self, workers=None, deadline_ms=8.0, depth=90, use_processes=True, max_rollouts=10000, plugins=()):
+        """Pick Pac-Man's direction at junctions by Monte Carlo rollouts
+
+        Rollouts restore a snapshot into each worker's headless game and play
+        it forward with the real ghost rules for depth ticks, in parallel on a
+        process (or thread) pool, until the per-decision deadline. plugins
+        are modules registering ghost brains, imported in every worker.
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.deadline = deadline_ms / 1000.0
+        self.depth = depth
+        self.max_rollouts = max_rollouts
+        executor = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+        self.pool = executor(max_workers=self.workers, initializer=_load_plugins, initargs=(tuple(plugins),))
+        self.rng = random.Random()
+        wait([self.pool.submit(_warm_up) for _ in range(self.workers)])
+
+        # Stats
+        self.decisions = 0
+        self.rollouts = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+
+    def update(self, game):
+        """Choose a direction at junctions (call once per tick before Game moves Pac-Man)"""
+        pacman = game.pacman
+        game_map = game.map
+        if not at_cell_center(pacman, game_map):
+            return
+
+        cell_size = game_map.cell_size
+        cell = (int(pacman.x // cell_size), int(pacman.y // cell_size))
+        exits = game_map.compiled.exits.get(cell, ())
+        forward_open = pacman.direction in exits
+        if len(exits) <= 2 and forward_open:
+            return  # In a corridor, keep going
+
+        if len(exits) == 1:
+            pacman.change_direction(exits[0])
+            return
+
+        pacman.change_direction(self.decide(game, exits))
+
+    def decide(self, game, directions):
+        """Run rollouts for each candidate direction and return the best one"""
+        start = time.perf_counter()
+        state = snapshot(game)
+        deadline = time.time() + self.deadline
+        per_worker = max(1, self.max_rollouts // self.workers)
+
+        futures = [
+            self.pool.submit(run_rollouts, state, directions, self.depth, deadline, per_worker,
+                             self.rng.getrandbits(32), tuple(game.ghost_brains), game.turn_buffer)
+            for _ in range(self.workers)
+        ]
+        # Workers stop on their own at the deadline; the small grace covers IPC
+        done, _ = wait(futures, timeout=self.deadline * 2)
+
+        totals = {direction: [0.0, 0] for direction in directions}
+        for future in done:
+            for direction, (value, count) in future.result().items():
+                totals[direction][0] += value
+                totals[direction][1] += count
+
+        best = max(directions, key=lambda d: totals[d][0] / totals[d][1] if totals[d][1] else float('-inf'))
+
+        elapsed = time.perf_counter() - start
+        self.decisions += 1
+        self.rollouts += sum(count for _, count in totals.values())
+        self.total_time += elapsed
+        self.max_time = max(self.max_time, elapsed)
+        return best
+
+    @property
+    def rollouts_per_second(self):
+        """Rollouts completed per second of decision time"""
+        return self.rollouts / self.total_time if self.total_time else 0.0
+
+    def close(self):
+        """Shut down the worker pool"""
+        self.pool.shutdown(cancel_futures=True)
+
+    def report(self):
+        """Planning statistics as a short text summary"""
+        mean = self.total_time / self.decisions * 1000 if self.decisions else 0.0
+        return (f"rollout planner: {self.decisions} decisions, {self.rollouts} rollouts "
+                f"({self.rollouts_per_second:.0f}/s on {self.workers} workers), "
+                f"mean {mean:.2f} ms, max {self.max_time * 1000:.2f} ms per decision")
@@ -0,0 +1,138 @@
+import struct
+
+# Codes used to store states and directions in a single byte
+STATES = ["MENU", "PLAYING", "PAUSED", "GAME_OVER", "WIN"]
+DIRECTIONS = [None, "UP", "DOWN", "LEFT", "RIGHT"]
+STATE_CODES = {state: i for i, state in enumerate(STATES)}
+DIRECTION_CODES = {direction: i for i, direction in enumerate(DIRECTIONS)}
+
+# Field layouts (little-endian, no padding)
+GAME_FORMAT = "BiBH?hH"  # state, score, lives, level, power_mode, power_timer, collected_pellets
+PACMAN_FORMAT = "ddBBBbbI"  # x, y, direction, next_direction, animation_timer, mouth_angle, mouth_direction, turn_age
+GHOST_FORMAT = "ddB?hd"  # x, y, direction, frightened, frightened_timer, animation_frame
+
+class StateCodec:
+    def __init__(self, num_ghosts, num_cells):
+        """Pack and restore render-free game state for a fixed ghost count and map size
+
+        Covers the game counters, Pac-Man, every ghost and the pellet bitset.
+        The maze itself is identified by the level number. Sprites, rects and
+        the random number generator are not included.
+        """
+        self.num_ghosts = num_ghosts
+        self.num_cells = num_cells
+        self.pellet_bytes = (num_cells + 7) // 8
+        self.struct = struct.Struct(
+            "<" + GAME_FORMAT + PACMAN_FORMAT + GHOST_FORMAT * num_ghosts + f"{self.pellet_bytes}s"
+        )
+        self.size = self.struct.size
+
+    @classmethod
+    def for_game(cls, game):
+        """Get the (shared) codec matching a game's ghosts and map"""
+        key = (len(game.ghosts), game.map.width * game.map.height)
+        codec = _codecs.get(key)
+        if codec is None:
+            codec = _codecs[key] = cls(*key)
+        return codec
+
+    def _values(self, game):
+        """Flatten the game state into the struct's field order"""
+        pacman = game.pacman
+        values = [
+            STATE_CODES[game.state], game.score, game.lives, game.level,
+            game.power_mode, game.power_timer, game.collected_pellets,
+            pacman.x, pacman.y, DIRECTION_CODES[pacman.direction], DIRECTION_CODES[pacman.next_direction],
+            pacman.animation_timer, pacman.mouth_angle, pacman.mouth_direction, pacman.turn_age,
+        ]
+        for ghost in game.ghosts:
+            values += (ghost.x, ghost.y, DIRECTION_CODES[ghost.direction], ghost.frightened,
+                       ghost.frightened_timer, ghost.animation_frame)
+        values.append(game.map.pellet_bits.to_bytes(self.pellet_bytes, "little"))
+        return values
+
+    def pack(self, game):
+        """Snapshot a game into a new bytes object"""
+        return self.struct.pack(*self._values(game))
+
+    def pack_into(self, buffer, offset, game):
+        """Snapshot a game into a writable buffer at offset"""
+        self.struct.pack_into(buffer, offset, *self._values(game))
+
+    def restore(self, game, data, offset=0):
+        """Put a game back into a snapshotted state"""
+        values = self.struct.unpack_from(data, offset)
+        if values[3] != game.level:
+            # Snapshot from another level: switch to its maze first
+            game.start_level(values[3])
+        (state, game.score, game.lives, game.level, game.power_mode, game.power_timer,
+         game.collected_pellets) = values[:7]
+        game.state = STATES[state]
+
+        pacman = game.pacman
+        (pacman.x, pacman.y, direction, next_direction, pacman.animation_timer,
+         pacman.mouth_angle, pacman.mouth_direction, pacman.turn_age) = values[7:15]
+        pacman.direction = DIRECTIONS[direction]
+        pacman.next_direction = DIRECTIONS[next_direction]
+        pacman.rect.center = (pacman.x, pacman.y)
+
+        index = 15
+        for ghost in game.ghosts:
+            (ghost.x, ghost.y, direction, ghost.frightened, ghost.frightened_timer,
+             ghost.animation_frame) = values[index:index + 6]
+            ghost.direction = DIRECTIONS[direction]
+            ghost.rect.center = (ghost.x, ghost.y)
+            index += 6
+
+        game.map.set_pellet_bits(int.from_bytes(values[index], "little"))
+
+# Codecs shared between games of the same shape
+_codecs = {}
+
+def snapshot(game):
+    """Snapshot a game's state into bytes"""
+    return StateCodec.for_game(game).pack(game)
+
+def restore(game, data):
+    """Restore a game's state from snapshot() bytes"""
+    StateCodec.for_game(game).restore(game, data)
+
+class RewindBuffer:
+    def __init__(self, game, seconds=10, fps=60):
+        """Ring buffer of the last seconds of snapshots for rewinding"""
+        self.codec = StateCodec.for_game(game)
+        self.capacity = max(1, int(seconds * fps))
+        self.buffer = bytearray(self.codec.size * self.capacity)
+        self.head = 0  # Slot the next snapshot goes into
+        self.count = 0
+
+    @property
+    def nbytes(self):
+        """Memory used by the snapshot storage"""
+        return len(self.buffer)
+
+    def clear(self):
+        """Forget all recorded snapshots"""
+        self.head = 0
+        self.count = 0
+
+    def record(self, game):
+        """Add the game's current state, overwriting the oldest when full"""
+        self.codec.pack_into(self.buffer, self.head * self.codec.size, game)
+        self.head = (self.head + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def step_back(self, game, frames=1):
+        """Drop the newest frames and restore the game to the snapshot before them
+
+        Returns False once there is nothing older left to go back to.
+        """
+        if self.count == 0:
+            return False
+
+        frames = min(frames, self.count - 1)
+        self.head = (self.head - frames) % self.capacity
+        self.count -= frames
+        newest = (self.head - 1) % self.capacity
+        self.codec.restore(game, self.buffer, newest * self.codec.size)
+        return frames > 0
@@ -0,0 +1,27 @@
+def first_contact(a, a_velocity, b, b_velocity, reach, duration):
+    """Earliest time in [0, duration] at which two moving boxes overlap
+
+    a and b are box centers moving at constant velocities (per tick). The
+    boxes overlap while the centers are closer than reach on both axes.
+    Returns None if they never do within duration ticks, which catches
+    entities that pass through each other between two ticks.
+    """
+    start, end = 0.0, float(duration)
+    for axis in (0, 1):
+        gap = b[axis] - a[axis]
+        closing = b_velocity[axis] - a_velocity[axis]
+        if closing == 0:
+            if abs(gap) >= reach:
+                return None
+            continue
+
+        # Times at which the gap on this axis is inside (-reach, reach)
+        enter = (-reach - gap) / closing
+        leave = (reach - gap) / closing
+        if enter > leave:
+            enter, leave = leave, enter
+        start = max(start, enter)
+        end = min(end, leave)
+        if start >= end:
+            return None
+    return start
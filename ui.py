@@ -1,5 +1,6 @@
 import pygame
 import math
+import assets
 
 # Colors
 BLACK = (0, 0, 0)
@@ -21,9 +22,14 @@ class UI:
         self.medium_font = pygame.font.Font(None, 36)
         self.small_font = pygame.font.Font(None, 24)
         
-        # Try to load logo
+        # Try to load logo (may still be loading in the background)
+        self.has_logo = False
+        self.load_logo()
+    
+    def load_logo(self):
+        """Load the logo image if it is available"""
         try:
-            self.logo = pygame.image.load('assets/images/logo.png')
+            self.logo = assets.load_image('assets/images/logo.png')
             self.logo = pygame.transform.scale(self.logo, (300, 100))
             self.has_logo = True
         except:
@@ -51,6 +57,10 @@ class UI:
         # Background
         self.surface.fill(BLACK)
         
+        # Pick up the logo once background loading has finished
+        if not self.has_logo:
+            self.load_logo()
+        
         # Draw decorative elements
         for i in range(0, self.width, 30):
             pygame.draw.circle(self.surface, BLUE, (i, 20), 5)
@@ -125,6 +135,8 @@ class UI:
         self.draw_text("Use Arrow Keys to Move", self.small_font, WHITE, self.width // 2, y_pos)
         y_pos += 30
         self.draw_text("ESC to Pause", self.small_font, WHITE, self.width // 2, y_pos)
+        y_pos += 30
+        self.draw_text("Hold BACKSPACE to Rewind", self.small_font, WHITE, self.width // 2, y_pos)
         
         # Credits
         self.draw_text("© 2025 Pac-Man Clone", self.small_font, WHITE, self.width // 2, self.height - 30)
@@ -146,6 +158,10 @@ class UI:
         for i in range(lives):
             pygame.draw.circle(self.surface, YELLOW, (life_x + i * 30, life_y), 10)
     
+    def draw_pacing(self, text):
+        """Draw the frame pacing counters in the bottom right corner"""
+        self.draw_text(text, self.small_font, WHITE, self.width - 10, self.height - 30, "right")
+    
     def draw_pause_screen(self):
         """Draw the pause screen overlay"""
         # Semi-transparent overlay
@@ -170,20 +186,24 @@ class UI:
         self.draw_text(f"FINAL SCORE: {score}", self.medium_font, WHITE, self.width // 2, self.height // 2)
         self.draw_text("Press ENTER to Play Again", self.medium_font, WHITE, self.width // 2, self.height // 2 + 60)
     
-    def draw_win_screen(self, score):
-        """Draw the win screen"""
-        # Semi-transparent overlay with animated colors
-        overlay = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-        
-        # Create a pulsating color effect
-        pulse = (pygame.time.get_ticks() % 2000) / 2000.0
-        if pulse < 0.5:
-            alpha = int(128 + 127 * (pulse * 2))
+    def draw_win_screen(self, score, animate=True):
+        """Draw the win screen (animate=False keeps the overlay still)"""
+        if animate:
+            # Semi-transparent overlay with animated colors
+            overlay = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+            
+            # Create a pulsating color effect
+            pulse = (pygame.time.get_ticks() % 2000) / 2000.0
+            if pulse < 0.5:
+                alpha = int(128 + 127 * (pulse * 2))
+            else:
+                alpha = int(255 - 127 * ((pulse - 0.5) * 2))
+            
+            overlay.fill((0, 0, 100, alpha))
+            self.surface.blit(overlay, (0, 0))
         else:
-            alpha = int(255 - 127 * ((pulse - 0.5) * 2))
-        
-        overlay.fill((0, 0, 100, alpha))
-        self.surface.blit(overlay, (0, 0))
+            # A plain dark blue backdrop
+            self.surface.fill((0, 0, 100))
         
         # Win text
         self.draw_text("YOU WIN!", self.large_font, YELLOW, self.width // 2, self.height // 2 - 60)
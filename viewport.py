@@ -0,0 +1,51 @@
+import pygame
+
+BLACK = (0, 0, 0)
+
+class Viewport:
+    def __init__(self, window, logical_size, smooth=False):
+        """Draw at a fixed logical resolution and scale each frame to fit the window
+
+        The game draws into target, a surface of logical_size, so the map
+        layers and sprites it caches never depend on the window size.
+        present() scales the finished frame once, straight into the largest
+        rect of the same shape that fits the window (black bars around
+        it). Only that rect is worked out again when the window is resized.
+        smooth uses smoothscale, which looks better at odd scales but
+        takes about twice as long to scale from 1080p up (see benchmark.py
+        viewport).
+        """
+        self.logical_size = tuple(logical_size)
+        self.smooth = smooth
+        self.target = pygame.Surface(self.logical_size, 0, window)
+        self.window = None
+        self.rect = None
+        self.output = None  # Part of the window the frame is scaled into
+        self.resizes = 0
+        self.resize(window)
+
+    def resize(self, window=None):
+        """Fit frames to a window of a new size (None: the current display surface)"""
+        self.window = window if window is not None else pygame.display.get_surface()
+        width, height = self.window.get_size()
+        logical_width, logical_height = self.logical_size
+        scale = min(width / logical_width, height / logical_height)
+
+        # Largest centered rect of the logical shape (empty while minimized)
+        self.rect = pygame.Rect(0, 0, round(logical_width * scale), round(logical_height * scale))
+        self.rect.center = (width // 2, height // 2)
+        self.rect = self.rect.clip(self.window.get_rect())
+        self.window.fill(BLACK)
+        self.output = self.window.subsurface(self.rect) if self.rect.width and self.rect.height else None
+        self.resizes += 1
+
+    def present(self):
+        """Scale the finished frame into the window (call before flipping)"""
+        if self.output is None:
+            return
+        if self.rect.size == self.logical_size:
+            self.output.blit(self.target, (0, 0))
+        elif self.smooth:
+            pygame.transform.smoothscale(self.target, self.rect.size, self.output)
+        else:
+            pygame.transform.scale(self.target, self.rect.size, self.output)